@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 from functools import lru_cache
 
 
@@ -7,12 +7,43 @@ class Settings(BaseSettings):
     # MongoDB
     mongodb_url: str = "mongodb://localhost:27017"
     database_name: str = "uigisc"
+    mongodb_max_pool_size: int = 100  # Per worker: size to expected concurrent queries (0 = driver default, 100)
+    mongodb_min_pool_size: int = 0  # Connections opened at startup and kept warm
+    mongodb_max_idle_time_ms: int = 0  # 0 = keep idle connections
+    mongodb_wait_queue_timeout_ms: int = 0  # 0 = wait for a free connection indefinitely
+    mongodb_compressors: str = ""  # e.g. "zstd,snappy,zlib" (zstd/snappy need extra packages)
+    mongodb_server_selection_timeout_ms: int = 30000  # 0 = driver default (30s)
+    mongodb_connect_timeout_ms: int = 20000  # 0 = driver default (20s)
+    mongodb_socket_timeout_ms: int = 0  # 0 = no socket timeout
+    mongodb_monitoring: bool = True  # Pool/command stats in /api/admin/metrics
     
     # JWT
     secret_key: str = "your-secret-key-change-in-production-min-32-chars"
     algorithm: str = "HS256"
+    jwt_backend: str = "jose"  # "jose", "pyjwt" or "hmac"; tokens are interchangeable
     access_token_expire_minutes: int = 1440  # 24 hours
     
+    # Verified access token cache (per worker)
+    token_cache_max_entries: int = 10000
+    token_cache_ttl_seconds: int = 300
+    
+    # Verification/reset code store: "mongo" (shared) or "memory" (single process)
+    code_store_backend: str = "mongo"
+    code_store_max_entries: int = 10000  # Memory backend only
+    code_store_sweep_seconds: float = 60.0  # Memory backend only
+    
+    # Password hashing ("bcrypt" or "argon2id"; argon2id needs argon2-cffi).
+    # Hashes made with other settings are upgraded on the next login.
+    password_hash_scheme: str = "bcrypt"
+    bcrypt_rounds: int = 12
+    argon2_time_cost: int = 3
+    argon2_memory_cost_kib: int = 65536
+    argon2_parallelism: int = 1
+    
+    # Password hashing pool (per worker)
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 32  # Extra waiting calls before returning 503
+    
     # Admin
     admin_emails: str = "admin@uigisc.com"
     
@@ -21,7 +52,10 @@ class Settings(BaseSettings):
     smtp_port: int = 587
     smtp_user: str = ""
     smtp_password: str = ""
+    smtp_start_tls: bool = True  # False only for local relays/test servers without STARTTLS
     email_from: str = "noreply@uigisc.com"
+    smtp_pool_size: int = 2  # Keep-alive SMTP connections per worker
+    smtp_pool_idle_check_seconds: float = 30.0  # NOOP before reusing a connection idle this long
     
     # Frontend
     frontend_url: str = "https://uigisc.com"
@@ -35,12 +69,51 @@ class Settings(BaseSettings):
     dospace_access_key: str = ""
     dospace_endpoint: str = ""
     dospace_bucket_name: str = ""
+    storage_max_concurrent_uploads: int = 4  # Per worker
+    storage_part_size_mb: int = 8  # Multipart part size (S3 minimum is 5)
+    storage_max_upload_mb: int = 20
+    # Object keys are content-addressed or random, so they never change
+    storage_cache_control: str = "public, max-age=31536000, immutable"
+    # Post-upload HEAD/ACL check: "always", "sampled", "deferred" or "off"
+    storage_verify_mode: str = "deferred"
+    storage_verify_sample_rate: int = 20  # 1 in N uploads when sampled
+    storage_presign_expires_seconds: int = 300  # Lifetime of direct-upload policies
+    
+    # Responsive image variants generated on upload
+    image_variants_enabled: bool = True
+    image_variant_widths: str = "480,960,1600"
+    image_variant_formats: str = "webp"  # Comma-separated: webp, avif
+    image_variant_quality: int = 80
+    image_process_workers: int = 1  # Processes per API worker
     
     # AWS SNS/SES Settings for Email Verification
     aws_access_key_id: str = ""
     aws_secret_access_key: str = ""
     aws_region: str = "us-east-1"
     ses_sender_email: str = ""  # Verified sender email in AWS SES
+    ses_send_mode: str = "inline"  # "inline" (wait for SES) or "queue" (background with retries)
+    ses_send_workers: int = 2
+    ses_queue_max_size: int = 1000
+    ses_max_send_rate: float = 14.0  # Emails per second per worker (SES account limit / workers)
+    ses_max_retries: int = 3
+
+    # Public catalog cache (per worker)
+    public_cache_max_entries: int = 10000
+    public_cache_ttl_seconds: int = 300  # Safety net if an invalidation is missed
+    
+    # Cross-worker cache invalidation: "local", "mongo_poll" or "change_stream"
+    cache_invalidation_backend: str = "mongo_poll"
+    cache_invalidation_poll_seconds: float = 1.0
+    
+    # HTTP caching for public endpoints
+    cache_control_default: str = "public, max-age=60, stale-while-revalidate=300"
+    # site and site_opportunities: pages users edit themselves, so revalidate
+    # every load (304s stay cheap) instead of serving a stale copy for minutes
+    cache_control_user_sites: str = "no-cache"
+    # Per-route overrides, e.g. "site_opportunities=public, max-age=30;page_content=no-cache"
+    cache_control_overrides: str = ""
+    # Render public lists straight from Mongo documents with orjson, skipping Pydantic
+    fast_json_responses: bool = False
 
     @property
     def do_secret(self) -> str:
@@ -62,6 +135,15 @@ class Settings(BaseSettings):
     def admin_email_list(self) -> List[str]:
         return [email.strip() for email in self.admin_emails.split(",")]
     
+    @property
+    def cache_control_map(self) -> Dict[str, str]:
+        overrides = {}
+        for entry in self.cache_control_overrides.split(";"):
+            if "=" in entry:
+                route, policy = entry.split("=", 1)
+                overrides[route.strip()] = policy.strip()
+        return overrides
+    
     class Config:
         env_file = ".env"
         extra = "ignore"
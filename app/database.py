@@ -1,18 +1,61 @@
+import asyncio
+from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from typing import Optional
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from typing import Dict, List, Optional
 from app.config import settings
+from app.services.db_monitoring import get_listeners
 
 # Global database client
 client: Optional[AsyncIOMotorClient] = None
 db: Optional[AsyncIOMotorDatabase] = None
 
 
+def _client_options() -> dict:
+    """Pool, compression and timeout options from settings (0/empty = driver default)."""
+    # pymongo reads 0 literally (unbounded pool, fail at once, no connect
+    # timeout), so unset values are left out rather than passed through
+    options = {"minPoolSize": settings.mongodb_min_pool_size}
+    if settings.mongodb_max_pool_size:
+        options["maxPoolSize"] = settings.mongodb_max_pool_size
+    if settings.mongodb_server_selection_timeout_ms:
+        options["serverSelectionTimeoutMS"] = settings.mongodb_server_selection_timeout_ms
+    if settings.mongodb_connect_timeout_ms:
+        options["connectTimeoutMS"] = settings.mongodb_connect_timeout_ms
+    if settings.mongodb_max_idle_time_ms:
+        options["maxIdleTimeMS"] = settings.mongodb_max_idle_time_ms
+    if settings.mongodb_socket_timeout_ms:
+        options["socketTimeoutMS"] = settings.mongodb_socket_timeout_ms
+    if settings.mongodb_wait_queue_timeout_ms:
+        options["waitQueueTimeoutMS"] = settings.mongodb_wait_queue_timeout_ms
+    if settings.mongodb_compressors:
+        options["compressors"] = settings.mongodb_compressors
+    if settings.mongodb_monitoring:
+        options["event_listeners"] = get_listeners()
+    return options
+
+
+async def _warm_up_pool():
+    """Open minPoolSize connections now instead of on the first requests."""
+    if settings.mongodb_min_pool_size <= 0:
+        return
+    try:
+        # Concurrent commands force that many connections to be checked out
+        await asyncio.gather(*(
+            client.admin.command("ping") for _ in range(settings.mongodb_min_pool_size)
+        ))
+    except Exception as e:
+        print(f"[WARNING] MongoDB pool warm-up failed: {e}")
+
+
 async def connect_to_database():
     """Connect to MongoDB on startup."""
     global client, db
-    client = AsyncIOMotorClient(settings.mongodb_url)
+    client = AsyncIOMotorClient(settings.mongodb_url, **_client_options())
     db = client[settings.database_name]
     
+    await _warm_up_pool()
+    
     # Create indexes
     await create_indexes()
     
@@ -22,26 +65,134 @@ async def connect_to_database():
 async def close_database_connection():
     """Close MongoDB connection on shutdown."""
     global client
+    if _index_task and not _index_task.done():
+        _index_task.cancel()
     if client:
         client.close()
         print("Closed MongoDB connection")
 
 
+# ==================== INDEXES ====================
+# Declarative index spec per collection. Bump INDEX_SCHEMA_VERSION whenever
+# it changes so running deployments apply it on their next boot.
+
+INDEX_SCHEMA_VERSION = 3
+
+# Public routes only read active documents
+ACTIVE = {"status": "active"}
+
+INDEX_SPECS: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel("email", unique=True),
+        IndexModel("subdomain", unique=True, sparse=True),
+        IndexModel("verification_token", sparse=True),
+    ],
+    "opportunities": [
+        IndexModel("status"),
+        IndexModel("order"),
+        # Public catalog: {status: "active"} sort order
+        IndexModel([("status", ASCENDING), ("order", ASCENDING)], partialFilterExpression=ACTIVE),
+    ],
+    "websites": [
+        IndexModel("subdomain", unique=True),
+        IndexModel("user_id"),
+        IndexModel("status"),
+        IndexModel([("created_at", DESCENDING)]),
+        # Public site lookup {subdomain, status: "active"} is served by the
+        # unique subdomain index (at most one document to check)
+    ],
+    "news_media": [
+        IndexModel("status"),
+        IndexModel("order"),
+        # Public list: {status: "active"} sort created_at desc
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING)], partialFilterExpression=ACTIVE),
+    ],
+    "event_categories": [
+        IndexModel("status"),
+        IndexModel("order"),
+        # Public list: {status: "active"} sort order
+        IndexModel([("status", ASCENDING), ("order", ASCENDING)], partialFilterExpression=ACTIVE),
+    ],
+    "event_highlights": [
+        IndexModel("category_id"),
+        IndexModel("order"),
+        # Public list: {status: "active"[, category_id]} sort [order, created_at desc]
+        IndexModel(
+            [("status", ASCENDING), ("order", ASCENDING), ("created_at", DESCENDING)],
+            partialFilterExpression=ACTIVE
+        ),
+        IndexModel(
+            [("status", ASCENDING), ("category_id", ASCENDING), ("order", ASCENDING), ("created_at", DESCENDING)],
+            partialFilterExpression=ACTIVE
+        ),
+    ],
+    "page_content": [
+        IndexModel("section_key"),
+    ],
+    # Single settings document: _id is enough
+    "site_settings": [],
+    # Cache invalidation events only need to outlive the poll window
+    "cache_invalidations": [
+        IndexModel("at", expireAfterSeconds=3600),
+    ],
+    # Verification/reset codes are removed by MongoDB once expires_at passes
+    "auth_codes": [
+        IndexModel("expires_at", expireAfterSeconds=0),
+    ],
+}
+
+# Indexes removed from INDEX_SPECS that deployments may still have, by name
+DROPPED_INDEXES: Dict[str, List[str]] = {
+    "websites": ["subdomain_1_status_1"],
+}
+
+# Collection holding the applied index schema version
+SCHEMA_META_COLLECTION = "schema_meta"
+
+_index_task: Optional[asyncio.Task] = None
+
+
+async def apply_indexes(database: AsyncIOMotorDatabase) -> None:
+    """Create every index in INDEX_SPECS (one createIndexes call per collection)
+    and drop the ones listed in DROPPED_INDEXES."""
+    await asyncio.gather(*(
+        database[name].create_indexes(models)
+        for name, models in INDEX_SPECS.items()
+        if models
+    ))
+    for name, index_names in DROPPED_INDEXES.items():
+        existing = await database[name].index_information()
+        for index_name in index_names:
+            if index_name in existing:
+                await database[name].drop_index(index_name)
+    await database[SCHEMA_META_COLLECTION].update_one(
+        {"_id": "indexes"},
+        {"$max": {"version": INDEX_SCHEMA_VERSION}, "$set": {"applied_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+async def _apply_indexes_in_background() -> None:
+    try:
+        await apply_indexes(db)
+        print(f"Applied index schema version {INDEX_SCHEMA_VERSION}")
+    except Exception as e:
+        # The marker stays behind, so the next boot retries
+        print(f"[ERROR] Failed to apply indexes: {e}")
+
+
 async def create_indexes():
-    """Create necessary database indexes."""
-    # Users collection indexes
-    await db.users.create_index("email", unique=True)
-    await db.users.create_index("subdomain", unique=True, sparse=True)
-    await db.users.create_index("verification_token", sparse=True)
+    """Bring indexes up to INDEX_SCHEMA_VERSION without blocking startup.
     
-    # Opportunities collection indexes
-    await db.opportunities.create_index("status")
-    await db.opportunities.create_index("order")
+    Workers that find the version marker current skip index work entirely;
+    otherwise the indexes are built in a background task.
+    """
+    global _index_task
+    marker = await db[SCHEMA_META_COLLECTION].find_one({"_id": "indexes"})
+    if marker and marker.get("version", 0) >= INDEX_SCHEMA_VERSION:
+        return
     
-    # Websites collection indexes
-    await db.websites.create_index("subdomain", unique=True)
-    await db.websites.create_index("user_id")
-    await db.websites.create_index("status")
+    _index_task = asyncio.create_task(_apply_indexes_in_background())
 
 
 def get_database() -> AsyncIOMotorDatabase:
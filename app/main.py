@@ -1,9 +1,16 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 
 from app.config import settings
 from app.database import connect_to_database, close_database_connection
+from app.services.invalidation import invalidation_bus
+from app.services.code_store import code_store
+from app.services.sns import ses_sender
+from app.services.email import smtp_pool
+from app.services.images import image_pipeline
+from app.services.auth import PasswordHasherBusyError
 from app.routes import auth, admin, public, user
 
 
@@ -12,8 +19,16 @@ async def lifespan(app: FastAPI):
     """Manage application lifecycle - startup and shutdown events."""
     # Startup
     await connect_to_database()
+    await invalidation_bus.start()
+    await code_store.start()
+    await ses_sender.start()
     yield
     # Shutdown
+    await ses_sender.stop()
+    await smtp_pool.close()
+    await code_store.stop()
+    await invalidation_bus.stop()
+    image_pipeline.shutdown()
     await close_database_connection()
 
 
@@ -33,6 +48,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusyError):
+    """Back-pressure: too many logins/registrations queued on this worker."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please try again shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
@@ -65,3 +65,26 @@ def event_highlight_helper(event: dict) -> dict:
         "created_at": event.get("created_at"),
     }
 
+
+def event_category_public_helper(category: dict) -> dict:
+    """Convert MongoDB event category document to its public JSON shape."""
+    return {
+        "id": str(category["_id"]),
+        "name": category.get("name", ""),
+        "order": category.get("order", 0),
+    }
+
+
+def event_highlight_public_helper(event: dict, category_name: str = "") -> dict:
+    """Convert MongoDB event highlight document to its public JSON shape."""
+    return {
+        "id": str(event["_id"]),
+        "vimeo_url": event.get("vimeo_url", ""),
+        "title": event.get("title", ""),
+        "category_id": event.get("category_id", ""),
+        "category_name": category_name,
+        "thumbnail_url": event.get("thumbnail_url", ""),
+        "duration": event.get("duration", ""),
+        "is_featured": event.get("is_featured", False),
+        "order": event.get("order", 0),
+    }
@@ -41,3 +41,16 @@ def news_media_helper(news: dict) -> dict:
         "created_at": news.get("created_at"),
     }
 
+
+def news_media_public_helper(news: dict) -> dict:
+    """Convert MongoDB news media document to its public JSON shape."""
+    return {
+        "id": str(news["_id"]),
+        "vimeo_url": news.get("vimeo_url", ""),
+        "title": news.get("title", ""),
+        "read_more_text": news.get("read_more_text", ""),
+        "read_more_url": news.get("read_more_url", ""),
+        "thumbnail_url": news.get("thumbnail_url", ""),
+        "is_featured": news.get("is_featured", False),
+        "order": news.get("order", 0),
+    }
@@ -59,3 +59,35 @@ def opportunity_helper(opportunity: dict) -> dict:
         "last_modified": opportunity.get("last_modified"),
         "created_at": opportunity.get("created_at"),
     }
+
+
+def button_public_helper(button: Optional[dict]) -> Optional[dict]:
+    """Normalize a stored button to its public JSON shape."""
+    if not button:
+        return None
+    return {
+        "text": button["text"],
+        "link": button["link"],
+        "type": button.get("type", "link"),
+    }
+
+
+def opportunity_public_helper(opportunity: dict) -> dict:
+    """Convert MongoDB opportunity document to its public JSON shape."""
+    return {
+        "id": str(opportunity["_id"]),
+        "name": opportunity["name"],
+        "image": opportunity.get("image", ""),
+        "description": opportunity.get("description", ""),
+        "videos": [
+            {"title": video["title"], "vimeo_id": video["vimeo_id"]}
+            for video in opportunity.get("videos", [])
+        ],
+        "bottom_description": opportunity.get("bottom_description", ""),
+        "telegram_link": opportunity.get("telegram_link"),
+        "primary_button": button_public_helper(opportunity.get("primary_button")),
+        "secondary_button": button_public_helper(opportunity.get("secondary_button")),
+        "status": opportunity.get("status", "active"),
+        "is_featured": opportunity.get("is_featured", False),
+        "order": opportunity.get("order", 0),
+    }
@@ -73,3 +73,19 @@ DEFAULT_CONTENT_MAP = {
     "products_header": DEFAULT_PRODUCTS_HEADER_CONTENT,
 }
 
+
+def page_content_public_helper(section_key: str, content: Optional[dict]) -> dict:
+    """Convert MongoDB page content document to its public JSON shape.
+    
+    Falls back to the default content for known sections.
+    """
+    if not content:
+        return {
+            "section_key": section_key,
+            "content": DEFAULT_CONTENT_MAP.get(section_key, {}),
+        }
+    
+    return {
+        "section_key": content.get("section_key", section_key),
+        "content": content.get("content", {}),
+    }
@@ -38,6 +38,16 @@ class SiteSettingsModel(BaseModel):
         json_encoders = {ObjectId: str}
 
 
+DEFAULT_SOCIAL_LINKS = {
+    "facebook": "",
+    "instagram": "",
+    "twitter": "",
+    "youtube": "",
+    "tiktok": "",
+    "telegram": ""
+}
+
+
 def site_settings_helper(settings: dict) -> dict:
     """Convert MongoDB site settings document to dict."""
     return {
@@ -57,3 +67,28 @@ def site_settings_helper(settings: dict) -> dict:
         "created_at": settings.get("created_at"),
     }
 
+
+def site_settings_public_helper(settings: Optional[dict]) -> dict:
+    """Convert MongoDB site settings document to its public JSON shape."""
+    if not settings:
+        settings = {}
+    
+    # Sort partners by order
+    partners = sorted(settings.get("partners", []), key=lambda p: p.get("order", 0))
+    social_links = settings.get("social_links", DEFAULT_SOCIAL_LINKS)
+    
+    return {
+        "hero_video_url": settings.get("hero_video_url", ""),
+        "facebook_group_link": settings.get("facebook_group_link", ""),
+        "partners": [
+            {
+                "id": partner["id"],
+                "image_url": partner["image_url"],
+                "name": partner.get("name", ""),
+                "link": partner.get("link", ""),
+                "order": partner.get("order", 0),
+            }
+            for partner in partners
+        ],
+        "social_links": {key: social_links.get(key, "") for key in DEFAULT_SOCIAL_LINKS},
+    }
@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Optional, List, Dict
+from pydantic import BaseModel, Field
+
+
+class UploadVariant(BaseModel):
+    """Resized/re-encoded variant of an uploaded image."""
+    url: str
+    width: int
+    format: str
+    size: int = 0
+
+
+class UploadModel(BaseModel):
+    """Uploaded file index entry, keyed by the SHA-256 of its content."""
+    id: str = Field(alias="_id")  # Hex SHA-256 digest
+    url: str
+    key: str
+    size: int = 0
+    content_type: str = ""
+    variants: Optional[List[UploadVariant]] = None
+    srcset: Optional[Dict[str, str]] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        populate_by_name = True
+
+
+def upload_helper(upload: dict) -> dict:
+    """Convert MongoDB upload document to dict."""
+    result = {
+        "digest": upload["_id"],
+        "url": upload["url"],
+        "key": upload.get("key", ""),
+        "size": upload.get("size", 0),
+        "content_type": upload.get("content_type", ""),
+        "created_at": upload.get("created_at"),
+    }
+
+    if upload.get("variants"):
+        result["variants"] = upload["variants"]
+        result["srcset"] = upload.get("srcset", {})
+
+    return result
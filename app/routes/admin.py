@@ -24,13 +24,17 @@ from app.schemas.page_content import (
 )
 from app.middleware.auth import get_admin_user
 from app.schemas.user import TokenData
+from app.schemas.upload import PresignUploadRequest, PresignUploadResponse, CompleteUploadRequest
 from app.models.opportunity import opportunity_helper
 from app.models.website import website_helper
 from app.models.site_settings import site_settings_helper
 from app.models.news_media import news_media_helper
 from app.models.event_highlight import event_category_helper, event_highlight_helper
 from app.models.page_content import page_content_helper, DEFAULT_CONTENT_MAP
-from app.services.storage import storage_service
+from app.services.storage import get_storage_service, UploadTooLargeError
+from app.services.images import image_pipeline, PROCESSABLE_TYPES
+from app.services.invalidation import notify_change
+from app.services.metrics import metrics
 import uuid
 
 router = APIRouter()
@@ -43,21 +47,45 @@ async def upload_image(
     file: UploadFile = File(...),
     current_user: TokenData = Depends(get_admin_user)
 ):
-    """Upload an image to DigitalOcean Spaces (admin only)."""
+    """Upload an image to DigitalOcean Spaces (admin only).
+    
+    Identical content returns the existing URL without a new upload.
+    Besides the original URL, raster images get resized WebP/AVIF variants
+    and a srcset manifest (`variants`, `srcset`) when the image pipeline is
+    enabled.
+    """
     if not file.content_type.startswith("image/"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File must be an image"
         )
     
+    storage_service = get_storage_service()
     try:
-        content = await file.read()
-        url = await storage_service.upload_file(
-            content, 
+        upload = await storage_service.upload_stream(
+            file, 
             file.filename, 
             file.content_type
         )
-        return {"url": url}
+        response = {"url": upload["url"]}
+        
+        if upload.get("variants"):
+            # Identical content was uploaded before; reuse its variants
+            response["variants"] = upload["variants"]
+            response["srcset"] = upload["srcset"]
+        elif image_pipeline.enabled and file.content_type in PROCESSABLE_TYPES:
+            # Size was already capped while streaming the original
+            manifest = await image_pipeline.create_variants(file.file, upload["url"], file.content_type)
+            if manifest:
+                await storage_service.save_variants(upload["digest"], manifest)
+                response.update(manifest)
+        
+        return response
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -65,6 +93,62 @@ async def upload_image(
         )
 
 
+@router.post("/upload/presign", response_model=PresignUploadResponse)
+async def presign_upload(
+    request: PresignUploadRequest,
+    current_user: TokenData = Depends(get_admin_user)
+):
+    """Get a presigned POST to upload an image straight to Spaces (admin only).
+    
+    The browser POSTs the file to `upload_url` with `fields`, then calls
+    /upload/complete. Direct uploads get a random key and are neither
+    deduplicated nor given resized variants; use /upload for that.
+    """
+    if not request.content_type.startswith("image/"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be an image"
+        )
+    
+    try:
+        return await get_storage_service().presign_upload(
+            request.filename, request.content_type, request.size
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+
+
+@router.post("/upload/complete")
+async def complete_upload(
+    request: CompleteUploadRequest,
+    current_user: TokenData = Depends(get_admin_user)
+):
+    """Confirm a finished direct upload and return its CDN URL (admin only)."""
+    if not get_storage_service().is_direct_key(request.key):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Not a direct upload key"
+        )
+    
+    upload = await get_storage_service().complete_presigned_upload(request.key)
+    if not upload:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found in storage"
+        )
+    
+    return {"url": upload["url"]}
+
+
+@router.get("/metrics")
+async def get_metrics(current_user: TokenData = Depends(get_admin_user)):
+    """Get in-process metrics for the worker serving this request (admin only)."""
+    return metrics.snapshot()
+
+
 # ==================== OPPORTUNITIES ====================
 
 @router.get("/opportunities", response_model=List[OpportunityResponse])
@@ -105,6 +189,7 @@ async def create_opportunity(
     }
     
     result = await db.opportunities.insert_one(opp_doc)
+    await notify_change("opportunities")
     opp_doc["_id"] = result.inserted_id
     
     return OpportunityResponse(**opportunity_helper(opp_doc))
@@ -119,14 +204,18 @@ async def reorder_opportunities(
     db = get_database()
     
     # Update order for each opportunity based on its position in the list
-    for idx, opp_id in enumerate(reorder_data.opportunity_ids):
-        try:
-            await db.opportunities.update_one(
-                {"_id": ObjectId(opp_id)},
-                {"$set": {"order": idx, "last_modified": datetime.utcnow()}}
-            )
-        except:
-            raise HTTPException(status_code=400, detail=f"Invalid opportunity ID: {opp_id}")
+    try:
+        for idx, opp_id in enumerate(reorder_data.opportunity_ids):
+            try:
+                await db.opportunities.update_one(
+                    {"_id": ObjectId(opp_id)},
+                    {"$set": {"order": idx, "last_modified": datetime.utcnow()}}
+                )
+            except:
+                raise HTTPException(status_code=400, detail=f"Invalid opportunity ID: {opp_id}")
+    finally:
+        # Once per reorder, even if it stopped halfway
+        await notify_change("opportunities")
     
     # Return the reordered list
     opportunities = []
@@ -186,6 +275,7 @@ async def update_opportunity(
         {"_id": ObjectId(opportunity_id)},
         {"$set": update_dict}
     )
+    await notify_change("opportunities")
     
     updated_opp = await db.opportunities.find_one({"_id": ObjectId(opportunity_id)})
     return OpportunityResponse(**opportunity_helper(updated_opp))
@@ -201,6 +291,7 @@ async def delete_opportunity(
     
     try:
         result = await db.opportunities.delete_one({"_id": ObjectId(opportunity_id)})
+        await notify_change("opportunities")
     except:
         raise HTTPException(status_code=400, detail="Invalid opportunity ID")
     
@@ -282,6 +373,7 @@ async def update_website(
         {"_id": ObjectId(website_id)},
         {"$set": update_dict}
     )
+    await notify_change(f"websites:{site['subdomain']}")
     
     updated_site = await db.websites.find_one({"_id": ObjectId(website_id)})
     
@@ -300,13 +392,15 @@ async def delete_website(
     db = get_database()
     
     try:
-        result = await db.websites.delete_one({"_id": ObjectId(website_id)})
+        site = await db.websites.find_one_and_delete({"_id": ObjectId(website_id)})
     except:
         raise HTTPException(status_code=400, detail="Invalid website ID")
     
-    if result.deleted_count == 0:
+    if not site:
         raise HTTPException(status_code=404, detail="Website not found")
     
+    await notify_change(f"websites:{site['subdomain']}")
+    
     return {"message": "Website deleted"}
 
 
@@ -337,6 +431,7 @@ async def get_site_settings(current_user: TokenData = Depends(get_admin_user)):
             "created_at": datetime.utcnow(),
         }
         result = await db.site_settings.insert_one(default_settings)
+        await notify_change("site_settings")
         default_settings["_id"] = result.inserted_id
         return SiteSettingsResponse(**site_settings_helper(default_settings))
     
@@ -377,6 +472,7 @@ async def update_site_settings(
             {"_id": settings["_id"]},
             {"$set": update_dict}
         )
+        await notify_change("site_settings")
         updated_settings = await db.site_settings.find_one({"_id": settings["_id"]})
     else:
         # Create new settings if none exist
@@ -396,6 +492,7 @@ async def update_site_settings(
             "created_at": datetime.utcnow(),
         }
         result = await db.site_settings.insert_one(new_settings)
+        await notify_change("site_settings")
         new_settings["_id"] = result.inserted_id
         updated_settings = new_settings
     
@@ -431,6 +528,7 @@ async def add_partner(
             {"_id": settings["_id"]},
             {"$push": {"partners": new_partner}, "$set": {"last_modified": datetime.utcnow()}}
         )
+        await notify_change("site_settings")
         updated_settings = await db.site_settings.find_one({"_id": settings["_id"]})
     else:
         # Create new settings if none exist
@@ -450,6 +548,7 @@ async def add_partner(
             "created_at": datetime.utcnow(),
         }
         result = await db.site_settings.insert_one(new_settings)
+        await notify_change("site_settings")
         new_settings["_id"] = result.inserted_id
         updated_settings = new_settings
     
@@ -479,6 +578,7 @@ async def delete_partner(
         {"_id": settings["_id"]},
         {"$set": {"partners": updated_partners, "last_modified": datetime.utcnow()}}
     )
+    await notify_change("site_settings")
     
     updated_settings = await db.site_settings.find_one({"_id": settings["_id"]})
     return SiteSettingsResponse(**site_settings_helper(updated_settings))
@@ -518,6 +618,7 @@ async def reorder_partners(
         {"_id": settings["_id"]},
         {"$set": {"partners": reordered_partners, "last_modified": datetime.utcnow()}}
     )
+    await notify_change("site_settings")
     
     updated_settings = await db.site_settings.find_one({"_id": settings["_id"]})
     return SiteSettingsResponse(**site_settings_helper(updated_settings))
@@ -561,6 +662,7 @@ async def create_news_media(
     }
     
     result = await db.news_media.insert_one(news_doc)
+    await notify_change("news_media")
     news_doc["_id"] = result.inserted_id
     
     return NewsMediaResponse(**news_media_helper(news_doc))
@@ -614,6 +716,7 @@ async def update_news_media(
         {"_id": ObjectId(item_id)},
         {"$set": update_dict}
     )
+    await notify_change("news_media")
     
     updated_item = await db.news_media.find_one({"_id": ObjectId(item_id)})
     return NewsMediaResponse(**news_media_helper(updated_item))
@@ -629,6 +732,7 @@ async def delete_news_media(
     
     try:
         result = await db.news_media.delete_one({"_id": ObjectId(item_id)})
+        await notify_change("news_media")
     except:
         raise HTTPException(status_code=400, detail="Invalid item ID")
     
@@ -674,6 +778,7 @@ async def create_event_category(
     }
     
     result = await db.event_categories.insert_one(category_doc)
+    await notify_change("event_categories")
     category_doc["_id"] = result.inserted_id
     
     return EventCategoryResponse(**event_category_helper(category_doc))
@@ -721,6 +826,7 @@ async def update_event_category(
         {"_id": ObjectId(category_id)},
         {"$set": update_dict}
     )
+    await notify_change("event_categories")
     
     updated_category = await db.event_categories.find_one({"_id": ObjectId(category_id)})
     return EventCategoryResponse(**event_category_helper(updated_category))
@@ -736,6 +842,7 @@ async def delete_event_category(
     
     try:
         result = await db.event_categories.delete_one({"_id": ObjectId(category_id)})
+        await notify_change("event_categories")
     except:
         raise HTTPException(status_code=400, detail="Invalid category ID")
     
@@ -799,6 +906,7 @@ async def create_event_highlight(
     }
     
     result = await db.event_highlights.insert_one(event_doc)
+    await notify_change("event_highlights")
     event_doc["_id"] = result.inserted_id
     
     response_data = event_highlight_helper(event_doc)
@@ -874,6 +982,7 @@ async def update_event_highlight(
         {"_id": ObjectId(event_id)},
         {"$set": update_dict}
     )
+    await notify_change("event_highlights")
     
     updated_event = await db.event_highlights.find_one({"_id": ObjectId(event_id)})
     event_data = event_highlight_helper(updated_event)
@@ -898,6 +1007,7 @@ async def delete_event_highlight(
     
     try:
         result = await db.event_highlights.delete_one({"_id": ObjectId(event_id)})
+        await notify_change("event_highlights")
     except:
         raise HTTPException(status_code=400, detail="Invalid event ID")
     
@@ -931,6 +1041,7 @@ async def get_page_content(
             "created_at": datetime.utcnow(),
         }
         result = await db.page_content.insert_one(new_content)
+        await notify_change("page_content")
         new_content["_id"] = result.inserted_id
         return PageContentResponse(**page_content_helper(new_content))
     
@@ -957,6 +1068,7 @@ async def update_page_content(
             {"_id": content["_id"]},
             {"$set": {"content": merged_content, "last_modified": datetime.utcnow()}}
         )
+        await notify_change("page_content")
         updated_content = await db.page_content.find_one({"_id": content["_id"]})
     else:
         # Create new content entry
@@ -967,6 +1079,7 @@ async def update_page_content(
             "created_at": datetime.utcnow(),
         }
         result = await db.page_content.insert_one(new_content)
+        await notify_change("page_content")
         new_content["_id"] = result.inserted_id
         updated_content = new_content
     
@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks
 from bson import ObjectId
 
 from app.database import get_database
@@ -10,8 +10,9 @@ from app.schemas.user import (
     ForgotPasswordRequest, VerifyResetCodeRequest, ResetPasswordRequest
 )
 from app.services.auth import (
-    get_password_hash, verify_password, create_access_token,
-    generate_verification_token, is_admin_email
+    get_password_hash_async, verify_password_async, create_access_token,
+    generate_verification_token, is_admin_email, needs_rehash,
+    PasswordHasherBusyError
 )
 from app.services.email import send_verification_email
 from app.services.sns import (
@@ -23,12 +24,29 @@ from app.services.sns import (
     clear_password_reset_code
 )
 from app.models.user import user_helper
+from app.services.invalidation import notify_change
 from app.middleware.auth import get_current_user
 from app.schemas.user import TokenData
 
 router = APIRouter()
 
 
+async def _upgrade_password_hash(user_id: ObjectId, password: str, old_hash: str):
+    """Rehash a password with the current parameters after a successful login."""
+    try:
+        new_hash = await get_password_hash_async(password)
+    except PasswordHasherBusyError:
+        return  # Try again on a later login
+    
+    db = get_database()
+    # Only replace the hash we verified, in case the password changed meanwhile
+    await db.users.update_one(
+        {"_id": user_id, "password_hash": old_hash},
+        {"$set": {"password_hash": new_hash}}
+    )
+    print(f"[AUTH] Upgraded password hash for user {user_id}")
+
+
 @router.post("/register", response_model=Token)
 async def register(user_data: UserCreate):
     """Register a new user with email, password, and subdomain."""
@@ -59,7 +77,7 @@ async def register(user_data: UserCreate):
     # Create user document - Auto-verify for now
     user_doc = {
         "email": user_data.email.lower(),
-        "password_hash": get_password_hash(user_data.password),
+        "password_hash": await get_password_hash_async(user_data.password),
         "subdomain": user_data.subdomain.lower(),
         "name": user_data.name.strip(),
         "mobile": user_data.mobile.strip(),
@@ -116,7 +134,7 @@ async def register(user_data: UserCreate):
 
 
 @router.post("/login", response_model=Token)
-async def login(credentials: UserLogin):
+async def login(credentials: UserLogin, background_tasks: BackgroundTasks):
     """Login with email and password."""
     db = get_database()
     
@@ -129,12 +147,18 @@ async def login(credentials: UserLogin):
         )
     
     # Verify password
-    if not verify_password(credentials.password, user["password_hash"]):
+    if not await verify_password_async(credentials.password, user["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
+    # Upgrade outdated hashes (cost or algorithm) once the response is sent
+    if needs_rehash(user["password_hash"]):
+        background_tasks.add_task(
+            _upgrade_password_hash, user["_id"], credentials.password, user["password_hash"]
+        )
+    
     # Create access token
     access_token = create_access_token(
         data={
@@ -238,6 +262,8 @@ async def verify_email(request: VerificationRequest):
             }
         }
     )
+    if user.get("subdomain"):
+        await notify_change(f"websites:{user['subdomain']}")
     
     return {"message": "Email verified successfully"}
 
@@ -279,7 +305,7 @@ async def verify_verification_code(request: VerifyCodeRequest):
     Verify the code entered by the user.
     Returns success if the code is valid.
     """
-    result = verify_code(request.email, request.code)
+    result = await verify_code(request.email, request.code)
     
     if not result['valid']:
         raise HTTPException(
@@ -366,7 +392,7 @@ async def verify_reset_code(request: VerifyResetCodeRequest):
         )
     
     # Verify the code
-    result = verify_password_reset_code(request.email, request.code)
+    result = await verify_password_reset_code(request.email, request.code)
     
     if not result['valid']:
         raise HTTPException(
@@ -394,9 +420,9 @@ async def reset_password(request: ResetPasswordRequest):
         )
     
     # Verify the reset code is valid and was verified
-    if not is_reset_code_verified(request.email):
+    if not await is_reset_code_verified(request.email):
         # If code wasn't verified, try to verify it now
-        result = verify_password_reset_code(request.email, request.code)
+        result = await verify_password_reset_code(request.email, request.code)
         if not result['valid']:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -404,7 +430,7 @@ async def reset_password(request: ResetPasswordRequest):
             )
     
     # Update the password
-    new_password_hash = get_password_hash(request.new_password)
+    new_password_hash = await get_password_hash_async(request.new_password)
     
     await db.users.update_one(
         {"_id": user["_id"]},
@@ -417,6 +443,6 @@ async def reset_password(request: ResetPasswordRequest):
     )
     
     # Clear the reset code
-    clear_password_reset_code(request.email)
+    await clear_password_reset_code(request.email)
     
     return {"success": True, "message": "Password has been reset successfully. You can now log in with your new password."}
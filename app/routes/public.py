@@ -1,5 +1,6 @@
-from typing import List
-from fastapi import APIRouter, HTTPException
+from typing import Any, Awaitable, Callable, List, Tuple, Type
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel
 
 from app.database import get_database
 from app.schemas.opportunity import OpportunityPublicResponse
@@ -8,42 +9,58 @@ from app.schemas.site_settings import SiteSettingsPublicResponse
 from app.schemas.news_media import NewsMediaPublicResponse
 from app.schemas.event_highlight import EventCategoryPublicResponse, EventHighlightPublicResponse
 from app.schemas.page_content import PageContentPublicResponse
-from app.models.opportunity import opportunity_helper
-from app.models.site_settings import site_settings_helper
-from app.models.news_media import news_media_helper
-from app.models.event_highlight import event_category_helper, event_highlight_helper
-from app.models.page_content import DEFAULT_CONTENT_MAP
+from app.models.opportunity import opportunity_public_helper
+from app.models.site_settings import site_settings_public_helper
+from app.models.news_media import news_media_public_helper
+from app.models.event_highlight import event_category_public_helper, event_highlight_public_helper
+from app.models.page_content import page_content_public_helper
+from app.config import settings
+from app.services.cache import public_cache
+from app.services.http_cache import RenderedPayload, conditional_response, payload_response
+from app.services.serialization import render_json
+from app.services.site_catalog import CatalogBase, SiteOverlay, compile_overlay
 
 router = APIRouter()
 
 
+def _project(schema: Type[BaseModel], data: dict) -> Any:
+    """Validate a public projection, unless fast JSON mode skips Pydantic."""
+    if settings.fast_json_responses:
+        return data
+    return schema(**data)
+
+
+async def _cached_payload(
+    key: str,
+    topics: Tuple[str, ...],
+    loader: Callable[[], Awaitable[Any]]
+) -> RenderedPayload:
+    """Load, render and cache a public response body."""
+    async def render() -> RenderedPayload:
+        return RenderedPayload(render_json(await loader()))
+    
+    return await public_cache.get_or_load(key, topics, render)
+
+
 @router.get("/opportunities", response_model=List[OpportunityPublicResponse])
-async def get_public_opportunities():
+async def get_public_opportunities(request: Request):
     """Get all active opportunities for the homepage."""
+    catalog = await public_cache.get_or_load(
+        "site_catalog", ("opportunities",), _load_site_catalog
+    )
+    return conditional_response(
+        request, "opportunities", f'"{catalog.digest}"', lambda: catalog.body
+    )
+
+
+async def _load_public_opportunities() -> list:
     db = get_database()
     
     opportunities = []
     cursor = db.opportunities.find({"status": "active"}).sort("order", 1)
     
     async for opp in cursor:
-        opp_id = str(opp["_id"])
-        
-        primary_button = opp.get("primary_button")
-            
-        opportunities.append(OpportunityPublicResponse(
-            id=opp_id,
-            name=opp["name"],
-            image=opp.get("image", ""),
-            description=opp.get("description", ""),
-            videos=opp.get("videos", []),
-            bottom_description=opp.get("bottom_description", ""),
-            telegram_link=opp.get("telegram_link"),
-            primary_button=primary_button,
-            secondary_button=opp.get("secondary_button"),
-            status=opp.get("status", "active"),
-            is_featured=opp.get("is_featured", False),
-            order=opp.get("order", 0)
-        ))
+        opportunities.append(_project(OpportunityPublicResponse, opportunity_public_helper(opp)))
     
     return opportunities
 
@@ -74,133 +91,100 @@ async def check_subdomain_availability(subdomain: str):
     
     
 @router.get("/site/{subdomain}", response_model=WebsitePublicResponse)
-async def get_user_site(subdomain: str):
+async def get_user_site(request: Request, subdomain: str):
     """Get public data for a user site."""
+    subdomain = subdomain.lower()
+    payload = await _cached_payload(
+        f"site:{subdomain}",
+        (f"websites:{subdomain}",),
+        lambda: _load_user_site(subdomain)
+    )
+    return payload_response(request, "site", payload)
+
+
+async def _load_user_site(subdomain: str) -> WebsitePublicResponse:
     db = get_database()
     
     site = await db.websites.find_one({
-        "subdomain": subdomain.lower(),
+        "subdomain": subdomain,
         "status": "active"
     })
     
     if not site:
         raise HTTPException(status_code=404, detail="Site not found")
     
-    return WebsitePublicResponse(
-        subdomain=site["subdomain"],
-        customizations=site.get("customizations", {})
-    )
+    return _project(WebsitePublicResponse, {
+        "subdomain": site["subdomain"],
+        "customizations": site.get("customizations", {})
+    })
 
 
 @router.get("/site/{subdomain}/opportunities", response_model=List[OpportunityPublicResponse])
-async def get_site_opportunities(subdomain: str):
-    """Get opportunities for a specific user site with customizations applied."""
+async def get_site_opportunities(request: Request, subdomain: str):
+    """Get opportunities for a specific user site with customizations applied.
+    
+    The active catalog is rendered once and shared by every site; each site
+    only keeps a compiled overlay of its custom button links, which is
+    spliced into the shared bytes per request.
+    """
+    subdomain = subdomain.lower()
+    catalog = await public_cache.get_or_load(
+        "site_catalog", ("opportunities",), _load_site_catalog
+    )
+    overlay = await public_cache.get_or_load(
+        f"site_overlay:{subdomain}",
+        (f"websites:{subdomain}",),
+        lambda: _load_site_overlay(subdomain)
+    )
+    return conditional_response(
+        request,
+        "site_opportunities",
+        f'"{catalog.digest}-{overlay.digest}"',
+        lambda: catalog.render(overlay)
+    )
+
+
+async def _load_site_catalog() -> CatalogBase:
+    return CatalogBase(await _load_public_opportunities())
+
+
+async def _load_site_overlay(subdomain: str) -> SiteOverlay:
     db = get_database()
     
-    # Get site
-    site = await db.websites.find_one({
-        "subdomain": subdomain.lower(),
-        "status": "active"
-    })
+    site = await db.websites.find_one(
+        {"subdomain": subdomain, "status": "active"},
+        {"customizations": 1}
+    )
     
     if not site:
         raise HTTPException(status_code=404, detail="Site not found")
     
-    customizations = site.get("customizations", {})
-    
-    # Get opportunities
-    opportunities = []
-    cursor = db.opportunities.find({"status": "active"}).sort("order", 1)
-    
-    async for opp in cursor:
-        opp_id = str(opp["_id"])
-        
-        # Apply customizations if any
-        primary_button = opp.get("primary_button")
-        secondary_button = opp.get("secondary_button")
-        
-        # Check for new format: {opp_id}_primary and {opp_id}_secondary
-        primary_key = f"{opp_id}_primary"
-        secondary_key = f"{opp_id}_secondary"
-        
-        # Also support legacy format: just {opp_id}
-        if primary_key in customizations and customizations[primary_key]:
-            # Override primary button link with user's custom link
-            if primary_button:
-                primary_button = {**primary_button, "link": customizations[primary_key]}
-            else:
-                primary_button = {"text": "Join Now", "link": customizations[primary_key], "type": "link"}
-        elif opp_id in customizations and customizations[opp_id]:
-            # Legacy format support
-            if primary_button:
-                primary_button = {**primary_button, "link": customizations[opp_id]}
-            else:
-                primary_button = {"text": "Join Now", "link": customizations[opp_id], "type": "link"}
-        
-        if secondary_key in customizations and customizations[secondary_key]:
-            # Override secondary button link with user's custom link
-            if secondary_button:
-                secondary_button = {**secondary_button, "link": customizations[secondary_key]}
-            else:
-                secondary_button = {"text": "Learn More", "link": customizations[secondary_key], "type": "link"}
-        
-        opportunities.append(OpportunityPublicResponse(
-            id=opp_id,
-            name=opp["name"],
-            image=opp.get("image", ""),
-            description=opp.get("description", ""),
-            videos=opp.get("videos", []),
-            bottom_description=opp.get("bottom_description", ""),
-            telegram_link=opp.get("telegram_link"),
-            primary_button=primary_button,
-            secondary_button=secondary_button,
-            status=opp.get("status", "active"),
-            is_featured=opp.get("is_featured", False),
-            order=opp.get("order", 0)
-        ))
-    
-    return opportunities
+    return compile_overlay(site.get("customizations", {}))
 
 
 @router.get("/site-settings", response_model=SiteSettingsPublicResponse)
-async def get_public_site_settings():
+async def get_public_site_settings(request: Request):
     """Get public site settings (hero video URL, partners, and social links)."""
+    payload = await _cached_payload("site_settings", ("site_settings",), _load_public_site_settings)
+    return payload_response(request, "site_settings", payload)
+
+
+async def _load_public_site_settings():
     db = get_database()
     
-    settings = await db.site_settings.find_one()
-    
-    default_social_links = {
-        "facebook": "",
-        "instagram": "",
-        "twitter": "",
-        "youtube": "",
-        "tiktok": "",
-        "telegram": ""
-    }
-    
-    if not settings:
-        # Return default empty settings
-        return SiteSettingsPublicResponse(
-            hero_video_url="",
-            facebook_group_link="",
-            partners=[],
-            social_links=default_social_links
-        )
-    
-    # Sort partners by order
-    partners = sorted(settings.get("partners", []), key=lambda p: p.get("order", 0))
-    
-    return SiteSettingsPublicResponse(
-        hero_video_url=settings.get("hero_video_url", ""),
-        facebook_group_link=settings.get("facebook_group_link", ""),
-        partners=partners,
-        social_links=settings.get("social_links", default_social_links)
-    )
+    site_settings = await db.site_settings.find_one()
+    
+    return _project(SiteSettingsPublicResponse, site_settings_public_helper(site_settings))
 
 
 @router.get("/news-media", response_model=List[NewsMediaPublicResponse])
-async def get_public_news_media():
+async def get_public_news_media(request: Request):
     """Get all active news and media items for the public page (newest first)."""
+    payload = await _cached_payload("news_media", ("news_media",), _load_public_news_media)
+    return payload_response(request, "news_media", payload)
+
+
+async def _load_public_news_media() -> list:
     db = get_database()
     
     items = []
@@ -208,41 +192,42 @@ async def get_public_news_media():
     cursor = db.news_media.find({"status": "active"}).sort("created_at", -1)
     
     async for item in cursor:
-        items.append(NewsMediaPublicResponse(
-            id=str(item["_id"]),
-            vimeo_url=item.get("vimeo_url", ""),
-            title=item.get("title", ""),
-            read_more_text=item.get("read_more_text", ""),
-            read_more_url=item.get("read_more_url", ""),
-            thumbnail_url=item.get("thumbnail_url", ""),
-            is_featured=item.get("is_featured", False),
-            order=item.get("order", 0)
-        ))
+        items.append(_project(NewsMediaPublicResponse, news_media_public_helper(item)))
     
     return items
 
 
 @router.get("/event-categories", response_model=List[EventCategoryPublicResponse])
-async def get_public_event_categories():
+async def get_public_event_categories(request: Request):
     """Get all active event categories."""
+    payload = await _cached_payload("event_categories", ("event_categories",), _load_public_event_categories)
+    return payload_response(request, "event_categories", payload)
+
+
+async def _load_public_event_categories() -> list:
     db = get_database()
     
     categories = []
     cursor = db.event_categories.find({"status": "active"}).sort("order", 1)
     
     async for category in cursor:
-        categories.append(EventCategoryPublicResponse(
-            id=str(category["_id"]),
-            name=category.get("name", ""),
-            order=category.get("order", 0)
-        ))
+        categories.append(_project(EventCategoryPublicResponse, event_category_public_helper(category)))
     
     return categories
 
 
 @router.get("/event-highlights", response_model=List[EventHighlightPublicResponse])
-async def get_public_event_highlights(category_id: str = None):
+async def get_public_event_highlights(request: Request, category_id: str = None):
     """Get all active event highlights, optionally filtered by category."""
+    payload = await _cached_payload(
+        f"event_highlights:{category_id or ''}",
+        ("event_categories", "event_highlights"),
+        lambda: _load_public_event_highlights(category_id)
+    )
+    return payload_response(request, "event_highlights", payload)
+
+
+async def _load_public_event_highlights(category_id: str = None) -> list:
     db = get_database()
     
     # First get all active categories to map IDs to names
@@ -265,38 +250,28 @@ async def get_public_event_highlights(category_id: str = None):
         if cat_id not in categories:
             continue
             
-        events.append(EventHighlightPublicResponse(
-            id=str(event["_id"]),
-            vimeo_url=event.get("vimeo_url", ""),
-            title=event.get("title", ""),
-            category_id=cat_id,
-            category_name=categories.get(cat_id, ""),
-            thumbnail_url=event.get("thumbnail_url", ""),
-            duration=event.get("duration", ""),
-            is_featured=event.get("is_featured", False),
-            order=event.get("order", 0)
+        events.append(_project(
+            EventHighlightPublicResponse,
+            event_highlight_public_helper(event, categories.get(cat_id, ""))
         ))
     
     return events
 
 
 @router.get("/page-content/{section_key}", response_model=PageContentPublicResponse)
-async def get_public_page_content(section_key: str):
+async def get_public_page_content(request: Request, section_key: str):
     """Get page content for a specific section (public)."""
+    payload = await _cached_payload(
+        f"page_content:{section_key}",
+        ("page_content",),
+        lambda: _load_public_page_content(section_key)
+    )
+    return payload_response(request, "page_content", payload)
+
+
+async def _load_public_page_content(section_key: str):
     db = get_database()
     
     content = await db.page_content.find_one({"section_key": section_key})
     
-    if not content:
-        # Return default content for known sections
-        default_content = DEFAULT_CONTENT_MAP.get(section_key, {})
-        
-        return PageContentPublicResponse(
-            section_key=section_key,
-            content=default_content
-        )
-    
-    return PageContentPublicResponse(
-        section_key=content.get("section_key", section_key),
-        content=content.get("content", {})
-    )
+    return _project(PageContentPublicResponse, page_content_public_helper(section_key, content))
@@ -7,6 +7,7 @@ from app.schemas.website import WebsiteUserUpdate, WebsiteResponse
 from app.middleware.auth import get_current_user
 from app.schemas.user import TokenData
 from app.models.website import website_helper
+from app.services.invalidation import notify_change
 
 router = APIRouter()
 
@@ -84,6 +85,7 @@ async def update_my_site_links(
             }
         }
     )
+    await notify_change(f"websites:{site['subdomain']}")
     
     updated_site = await db.websites.find_one({"_id": site["_id"]})
     return WebsiteResponse(**website_helper(updated_site))
@@ -122,5 +124,6 @@ async def remove_custom_link(
                 }
             }
         )
+        await notify_change(f"websites:{site['subdomain']}")
     
     return {"message": "Custom link removed"}
@@ -0,0 +1,23 @@
+from typing import Dict
+from pydantic import BaseModel, Field
+
+
+class PresignUploadRequest(BaseModel):
+    """Schema for requesting a direct-to-storage upload."""
+    filename: str = Field(..., min_length=1, max_length=255)
+    content_type: str
+    size: int = Field(..., gt=0, description="File size in bytes")
+
+
+class PresignUploadResponse(BaseModel):
+    """Schema for a presigned POST policy."""
+    url: str = Field(..., description="Final CDN URL of the file")
+    key: str
+    upload_url: str
+    fields: Dict[str, str]
+    expires_in: int
+
+
+class CompleteUploadRequest(BaseModel):
+    """Schema for confirming a finished direct upload."""
+    key: str
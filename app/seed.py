@@ -7,6 +7,7 @@ from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from app.config import settings
+from app.database import apply_indexes
 from app.services.auth import get_password_hash
 
 
@@ -18,12 +19,7 @@ async def seed_database():
     print(f"Seeding database: {settings.database_name}")
     
     # Create indexes
-    await db.users.create_index("email", unique=True)
-    await db.users.create_index("subdomain", unique=True, sparse=True)
-    await db.opportunities.create_index("status")
-    await db.opportunities.create_index("order")
-    await db.websites.create_index("subdomain", unique=True)
-    await db.websites.create_index("user_id")
+    await apply_indexes(db)
     
     # Check if admin exists
     admin_exists = await db.users.find_one({"email": "admin@uigisc.com"})
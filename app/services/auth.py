@@ -1,16 +1,59 @@
 from datetime import datetime, timedelta
 from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import hashlib
 import secrets
+import time
 
-from jose import JWTError, jwt
 import bcrypt
 
 from app.config import settings
 from app.schemas.user import TokenData
+from app.services.metrics import metrics
+from app.services.jwt_backends import TokenError, get_jwt_backend
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:
+    PasswordHasher = None
+
+
+# ==================== Password Hashing ====================
+# PASSWORD_HASH_SCHEME picks the algorithm for new hashes ("bcrypt" or
+# "argon2id"). Existing hashes of either kind keep verifying; needs_rehash()
+# flags the ones made with other parameters so login can upgrade them.
+
+_argon2_hasher = None
+if PasswordHasher is not None:
+    _argon2_hasher = PasswordHasher(
+        time_cost=settings.argon2_time_cost,
+        memory_cost=settings.argon2_memory_cost_kib,
+        parallelism=settings.argon2_parallelism
+    )
+
+if settings.password_hash_scheme == "argon2id" and _argon2_hasher is None:
+    print("[AUTH] PASSWORD_HASH_SCHEME=argon2id but argon2-cffi is not installed, using bcrypt")
+
+
+def _use_argon2() -> bool:
+    return settings.password_hash_scheme == "argon2id" and _argon2_hasher is not None
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hash."""
+    """Verify a plain password against a bcrypt or Argon2 hash."""
+    if hashed_password.startswith("$argon2"):
+        if _argon2_hasher is None:
+            print("[AUTH] Cannot verify Argon2 hash: argon2-cffi is not installed")
+            return False
+        try:
+            return _argon2_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+    
     return bcrypt.checkpw(
         plain_password.encode('utf-8'), 
         hashed_password.encode('utf-8')
@@ -18,11 +61,86 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password."""
-    salt = bcrypt.gensalt()
+    """Hash a password with the configured scheme and cost."""
+    if _use_argon2():
+        return _argon2_hasher.hash(password)
+    
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
     return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
 
+def needs_rehash(hashed_password: str) -> bool:
+    """Check if a stored hash was made with another scheme or cost."""
+    if _use_argon2():
+        if not hashed_password.startswith("$argon2id$"):
+            return True
+        return _argon2_hasher.check_needs_rehash(hashed_password)
+    
+    if hashed_password.startswith("$argon2"):
+        return True
+    
+    # bcrypt format: $2b$<rounds>$<salt+hash>
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return False
+    return rounds != settings.bcrypt_rounds
+
+
+class PasswordHasherBusyError(Exception):
+    """Raised when the password hashing pool is saturated."""
+    pass
+
+
+class PasswordHashPool:
+    """Bounded executor for bcrypt work.
+    
+    bcrypt releases the GIL, so hashing on a few threads keeps ~100ms+ of
+    CPU per call off the event loop. When more than `max_queue` calls are
+    already waiting, new ones are rejected instead of piling up.
+    """
+    
+    def __init__(self, workers: int, max_queue: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._max_pending = workers + max_queue
+        self._pending = 0
+    
+    async def run(self, func, *args):
+        if self._pending >= self._max_pending:
+            metrics.incr("auth.hash_pool.rejected")
+            raise PasswordHasherBusyError()
+        
+        self._pending += 1
+        metrics.gauge("auth.hash_pool.pending", self._pending)
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+        finally:
+            self._pending -= 1
+            metrics.gauge("auth.hash_pool.pending", self._pending)
+            metrics.observe("auth.hash_pool.seconds", time.perf_counter() - start)
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool (for use in request handlers)."""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool (for use in request handlers)."""
+    return await password_hash_pool.run(get_password_hash, password)
+
+
+jwt_backend = get_jwt_backend(settings.jwt_backend, settings.secret_key, settings.algorithm)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -33,15 +151,82 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    encoded_jwt = jwt_backend.encode(to_encode)
     
     return encoded_jwt
 
 
+class VerifiedTokenCache:
+    """Bounded LRU of already-verified access tokens (per worker).
+    
+    Keyed by the SHA-256 of the token so raw tokens are never kept around.
+    An entry lives until the token's exp or the TTL, whichever is sooner.
+    Only successfully verified tokens are stored.
+    """
+    
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+    
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode('utf-8')).digest()
+    
+    def get(self, token: str) -> Optional[TokenData]:
+        if self.max_entries <= 0:
+            return None
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            metrics.incr("auth.token_cache.misses")
+            return None
+        
+        token_data, expires_at = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            metrics.incr("auth.token_cache.misses")
+            return None
+        
+        self._entries.move_to_end(key)
+        metrics.incr("auth.token_cache.hits")
+        return token_data
+    
+    def set(self, token: str, token_data: TokenData, exp: Optional[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        
+        key = self._key(token)
+        self._entries[key] = (token_data, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        metrics.gauge("auth.token_cache.size", len(self._entries))
+    
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+token_cache = VerifiedTokenCache(
+    max_entries=settings.token_cache_max_entries,
+    ttl_seconds=settings.token_cache_ttl_seconds
+)
+
+
 def decode_access_token(token: str) -> Optional[TokenData]:
-    """Decode and validate a JWT access token."""
+    """Decode and validate a JWT access token.
+    
+    Tokens that already verified on this worker are served from token_cache.
+    """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+    
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        payload = jwt_backend.decode(token)
         user_id: str = payload.get("sub")
         email: str = payload.get("email")
         role: str = payload.get("role")
@@ -49,8 +234,10 @@ def decode_access_token(token: str) -> Optional[TokenData]:
         if user_id is None:
             return None
         
-        return TokenData(user_id=user_id, email=email, role=role)
-    except JWTError:
+        token_data = TokenData(user_id=user_id, email=email, role=role)
+        token_cache.set(token, token_data, payload.get("exp"))
+        return token_data
+    except TokenError:
         return None
 
 
@@ -0,0 +1,148 @@
+"""
+In-process read-through cache for public catalog data.
+
+Each gunicorn worker keeps its own copy. Entries depend on one or more
+topics (usually collection names); admin writes invalidate a topic and the
+next read repopulates every entry that depends on it.
+"""
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config import settings
+
+
+class _CacheEntry:
+    __slots__ = ("value", "generation", "topics", "expires_at")
+
+    def __init__(self, value: Any, generation: int, topics: Tuple[str, ...], expires_at: float):
+        self.value = value
+        self.generation = generation
+        self.topics = topics
+        self.expires_at = expires_at
+
+
+class _InFlightLoad:
+    __slots__ = ("task", "generation")
+
+    def __init__(self, task: "asyncio.Task", generation: int):
+        self.task = task
+        self.generation = generation
+
+
+class PublicCache:
+    """Bounded LRU cache with topic-based invalidation.
+
+    Every invalidation bumps a global generation counter and records it
+    against the topic. An entry is valid only if none of its topics were
+    invalidated after the entry's load started, so a slow read that races
+    with an admin write never stores stale data.
+
+    Concurrent misses for the same key share one load, as long as none of
+    its topics were invalidated after that load started.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, max_topics: Optional[int] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_topics = max_topics or max_entries * 4
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._invalidated_at: Dict[str, int] = {}
+        self._generation = 0
+        self._floor = 0
+        self._inflight: Dict[str, _InFlightLoad] = {}
+
+    def _is_current(self, generation: int, topics: Tuple[str, ...]) -> bool:
+        """Check that nothing in topics was invalidated after generation."""
+        if generation < self._floor:
+            return False
+        return all(self._invalidated_at.get(t, 0) <= generation for t in topics)
+
+    def _is_valid(self, entry: _CacheEntry) -> bool:
+        if time.monotonic() > entry.expires_at:
+            return False
+        return self._is_current(entry.generation, entry.topics)
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for key, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not self._is_valid(entry):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    async def get_or_load(
+        self,
+        key: str,
+        topics: Tuple[str, ...],
+        loader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return the cached value for key, calling loader on a miss."""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is None or not self._is_current(inflight.generation, topics):
+            generation = self._generation
+            # A task, so one cancelled request doesn't cancel the others' load
+            task = asyncio.ensure_future(self._load(key, topics, loader, generation))
+            inflight = _InFlightLoad(task, generation)
+            self._inflight[key] = inflight
+            task.add_done_callback(functools.partial(self._load_done, key, inflight))
+
+        return await asyncio.shield(inflight.task)
+
+    async def _load(
+        self,
+        key: str,
+        topics: Tuple[str, ...],
+        loader: Callable[[], Awaitable[Any]],
+        generation: int,
+    ) -> Any:
+        value = await loader()
+
+        entry = _CacheEntry(value, generation, topics, time.monotonic() + self.ttl_seconds)
+        if value is not None and self._is_valid(entry):
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def _load_done(self, key: str, inflight: _InFlightLoad, task: "asyncio.Task") -> None:
+        if self._inflight.get(key) is inflight:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
+
+    def invalidate(self, topic: str) -> None:
+        """Mark every entry depending on topic as stale."""
+        self._generation += 1
+        self._invalidated_at[topic] = self._generation
+
+        # Keep the topic map bounded: forget per-topic history and treat
+        # everything loaded before now as stale instead.
+        if len(self._invalidated_at) > self.max_topics:
+            self._invalidated_at.clear()
+            self._entries.clear()
+            self._floor = self._generation
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._generation += 1
+        self._floor = self._generation
+        self._invalidated_at.clear()
+        self._entries.clear()
+
+
+public_cache = PublicCache(
+    max_entries=settings.public_cache_max_entries,
+    ttl_seconds=settings.public_cache_ttl_seconds,
+)
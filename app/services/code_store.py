@@ -0,0 +1,235 @@
+"""
+Shared store for email verification and password reset codes.
+
+Codes must survive being checked by a different gunicorn worker than the
+one that sent them, so the default backend keeps them in MongoDB with a TTL
+index. Failed attempts are counted atomically, so parallel guesses can't
+exceed the attempt limit.
+
+Backends (settings.code_store_backend):
+- "mongo": `auth_codes` collection, shared by all workers (default)
+- "memory": per-process dict, for tests and single-worker development.
+  Bounded to CODE_STORE_MAX_ENTRIES (oldest codes are evicted first) and
+  swept for expired codes every CODE_STORE_SWEEP_SECONDS.
+"""
+import asyncio
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from pymongo import ReturnDocument
+
+from app.config import settings
+from app.database import get_database
+from app.services.metrics import metrics
+
+CODES_COLLECTION = "auth_codes"
+
+# Outcomes of CodeStore.check()
+CODE_OK = "ok"
+CODE_MISSING = "missing"
+CODE_EXPIRED = "expired"
+CODE_TOO_MANY_ATTEMPTS = "too_many_attempts"
+CODE_INVALID = "invalid"
+
+
+class MemoryCodeStore:
+    """In-process code store. Not shared between workers."""
+
+    def __init__(self, max_entries: int, sweep_interval: float):
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self._codes: "OrderedDict[Tuple[str, str], dict]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.sweep()
+
+    def sweep(self) -> int:
+        """Drop every expired code; returns how many were removed."""
+        now = datetime.utcnow()
+        expired = [key for key, stored in self._codes.items() if now > stored["expires_at"]]
+        for key in expired:
+            del self._codes[key]
+        if expired:
+            metrics.incr("code_store.expired", len(expired))
+        metrics.gauge("code_store.size", len(self._codes))
+        return len(expired)
+
+    async def put(self, kind: str, email: str, code: str, ttl_seconds: int) -> None:
+        """Store a fresh code, replacing any previous one."""
+        self._codes[(kind, email)] = {
+            "code": code,
+            "expires_at": datetime.utcnow() + timedelta(seconds=ttl_seconds),
+            "attempts": 0,
+            "verified": False,
+        }
+        self._codes.move_to_end((kind, email))
+        
+        # Hard cap: under a flood of sends the oldest codes go first
+        while len(self._codes) > self.max_entries:
+            self._codes.popitem(last=False)
+            metrics.incr("code_store.evictions")
+        metrics.gauge("code_store.size", len(self._codes))
+
+    def _live(self, kind: str, email: str) -> Optional[dict]:
+        stored = self._codes.get((kind, email))
+        if stored is not None and datetime.utcnow() > stored["expires_at"]:
+            del self._codes[(kind, email)]
+            return None
+        return stored
+
+    async def check(self, kind: str, email: str, code: str, max_attempts: int, consume: bool) -> Tuple[str, int]:
+        """Check a code attempt; returns (outcome, attempts remaining).
+
+        A matching code is deleted if `consume`, otherwise marked verified.
+        """
+        stored = self._codes.get((kind, email))
+        if stored is None:
+            return CODE_MISSING, 0
+        if datetime.utcnow() > stored["expires_at"]:
+            del self._codes[(kind, email)]
+            return CODE_EXPIRED, 0
+        if stored["attempts"] >= max_attempts:
+            del self._codes[(kind, email)]
+            return CODE_TOO_MANY_ATTEMPTS, 0
+
+        if stored["code"] != code:
+            stored["attempts"] += 1
+            return CODE_INVALID, max_attempts - stored["attempts"]
+
+        if consume:
+            del self._codes[(kind, email)]
+        else:
+            stored["verified"] = True
+        return CODE_OK, max_attempts - stored["attempts"]
+
+    async def exists(self, kind: str, email: str) -> bool:
+        """Check if an unexpired code is pending for email."""
+        return self._live(kind, email) is not None
+
+    async def is_verified(self, kind: str, email: str) -> bool:
+        """Check if the pending code for email was already verified."""
+        stored = self._live(kind, email)
+        return bool(stored and stored["verified"])
+
+    async def delete(self, kind: str, email: str) -> None:
+        self._codes.pop((kind, email), None)
+
+
+class MongoCodeStore:
+    """Code store shared by all workers through a TTL-indexed collection."""
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    @staticmethod
+    def _collection():
+        return get_database()[CODES_COLLECTION]
+
+    @staticmethod
+    def _id(kind: str, email: str) -> str:
+        return f"{kind}:{email}"
+
+    async def put(self, kind: str, email: str, code: str, ttl_seconds: int) -> None:
+        """Store a fresh code, replacing any previous one."""
+        await self._collection().replace_one(
+            {"_id": self._id(kind, email)},
+            {
+                "kind": kind,
+                "code": code,
+                "expires_at": datetime.utcnow() + timedelta(seconds=ttl_seconds),
+                "attempts": 0,
+                "verified": False,
+            },
+            upsert=True
+        )
+
+    async def check(self, kind: str, email: str, code: str, max_attempts: int, consume: bool) -> Tuple[str, int]:
+        """Check a code attempt; returns (outcome, attempts remaining).
+
+        A matching code is deleted if `consume`, otherwise marked verified.
+        """
+        collection = self._collection()
+        now = datetime.utcnow()
+        live = {
+            "_id": self._id(kind, email),
+            "expires_at": {"$gt": now},
+            "attempts": {"$lt": max_attempts},
+        }
+
+        # Correct code: consume it in the same operation that checks it
+        if consume:
+            matched = await collection.find_one_and_delete({**live, "code": code})
+        else:
+            matched = await collection.find_one_and_update(
+                {**live, "code": code},
+                {"$set": {"verified": True}}
+            )
+        if matched:
+            return CODE_OK, max_attempts - matched["attempts"]
+
+        # Wrong code: count the attempt, never past the limit
+        failed = await collection.find_one_and_update(
+            live,
+            {"$inc": {"attempts": 1}},
+            return_document=ReturnDocument.AFTER
+        )
+        if failed:
+            return CODE_INVALID, max_attempts - failed["attempts"]
+
+        # Missing, expired (the TTL monitor only runs every minute) or exhausted
+        stored = await collection.find_one_and_delete({
+            "_id": self._id(kind, email),
+            "$or": [{"expires_at": {"$lte": now}}, {"attempts": {"$gte": max_attempts}}],
+        })
+        if stored is None:
+            return CODE_MISSING, 0
+        if stored["expires_at"] <= now:
+            return CODE_EXPIRED, 0
+        return CODE_TOO_MANY_ATTEMPTS, 0
+
+    async def exists(self, kind: str, email: str) -> bool:
+        """Check if an unexpired code is pending for email."""
+        stored = await self._collection().find_one(
+            {"_id": self._id(kind, email), "expires_at": {"$gt": datetime.utcnow()}},
+            {"_id": 1}
+        )
+        return stored is not None
+
+    async def is_verified(self, kind: str, email: str) -> bool:
+        """Check if the pending code for email was already verified."""
+        stored = await self._collection().find_one(
+            {"_id": self._id(kind, email), "expires_at": {"$gt": datetime.utcnow()}, "verified": True},
+            {"_id": 1}
+        )
+        return stored is not None
+
+    async def delete(self, kind: str, email: str) -> None:
+        await self._collection().delete_one({"_id": self._id(kind, email)})
+
+
+def _create_store():
+    if settings.code_store_backend == "memory":
+        return MemoryCodeStore(settings.code_store_max_entries, settings.code_store_sweep_seconds)
+    return MongoCodeStore()
+
+
+code_store = _create_store()
@@ -0,0 +1,84 @@
+"""
+MongoDB pool and command monitoring.
+
+pymongo listeners feed connection pool and command statistics into the
+metrics registry (GET /api/admin/metrics), so the pool can be sized from
+real checkout waits instead of guesses. Listeners are called from driver
+threads; the metrics registry is thread-safe.
+"""
+import threading
+
+from pymongo import monitoring
+
+from app.services.metrics import metrics
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Open/in-use connection gauges and checkout wait times."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open = 0
+        self._in_use = 0
+
+    def _adjust(self, open_delta: int = 0, in_use_delta: int = 0) -> None:
+        with self._lock:
+            self._open += open_delta
+            self._in_use += in_use_delta
+            metrics.gauge("mongo.pool.open", self._open)
+            metrics.gauge("mongo.pool.in_use", self._in_use)
+
+    def connection_created(self, event):
+        self._adjust(open_delta=1)
+
+    def connection_closed(self, event):
+        self._adjust(open_delta=-1)
+
+    def connection_checked_out(self, event):
+        self._adjust(in_use_delta=1)
+        metrics.observe("mongo.pool.checkout_wait", event.duration)
+
+    def connection_checked_in(self, event):
+        self._adjust(in_use_delta=-1)
+
+    def connection_check_out_failed(self, event):
+        metrics.incr(f"mongo.pool.checkout_failed.{event.reason}")
+        metrics.observe("mongo.pool.checkout_wait", event.duration)
+
+    def pool_cleared(self, event):
+        metrics.incr("mongo.pool.cleared")
+
+    # Unused pool events
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Per-command latency and failure counts."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        metrics.observe(f"mongo.command.{event.command_name}", event.duration_micros / 1_000_000)
+
+    def failed(self, event):
+        metrics.incr(f"mongo.command_failed.{event.command_name}")
+        metrics.observe(f"mongo.command.{event.command_name}", event.duration_micros / 1_000_000)
+
+
+def get_listeners() -> list:
+    """Listeners to pass to the MongoDB client (event_listeners=...)."""
+    return [PoolMetricsListener(), CommandMetricsListener()]
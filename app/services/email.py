@@ -1,9 +1,159 @@
-from typing import Optional
+from typing import List, Optional
+import asyncio
+import time
 import aiosmtplib
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 from app.config import settings
+from app.services.metrics import metrics
+from app.services.email_templates import RenderedEmail, render_email
+
+
+# ==================== SMTP CONNECTION POOL ====================
+
+class _PooledConnection:
+    __slots__ = ("smtp", "last_used")
+    
+    def __init__(self):
+        self.smtp: Optional[aiosmtplib.SMTP] = None
+        self.last_used = 0.0
+
+
+class SmtpPool:
+    """Small pool of authenticated, keep-alive SMTP connections (per worker).
+    
+    Connections are opened lazily. One that sat idle longer than
+    SMTP_POOL_IDLE_CHECK_SECONDS is checked with NOOP before reuse, and a
+    send that fails because the server dropped the connection is retried
+    once on a fresh one.
+    """
+    
+    def __init__(self, size: int, idle_check_seconds: float):
+        self.idle_check_seconds = idle_check_seconds
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for _ in range(max(size, 1)):
+            self._idle.put_nowait(_PooledConnection())
+    
+    async def _connect(self, conn: _PooledConnection) -> None:
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.smtp_host,
+            port=settings.smtp_port,
+            username=settings.smtp_user,
+            password=settings.smtp_password,
+            start_tls=settings.smtp_start_tls,
+        )
+        await smtp.connect()
+        conn.smtp = smtp
+        metrics.incr("smtp.connects")
+    
+    async def _disconnect(self, conn: _PooledConnection) -> None:
+        if conn.smtp is not None:
+            try:
+                await conn.smtp.quit()
+            except Exception:
+                conn.smtp.close()
+            conn.smtp = None
+    
+    async def _ensure_healthy(self, conn: _PooledConnection) -> None:
+        if conn.smtp is not None and not conn.smtp.is_connected:
+            conn.smtp = None
+        if conn.smtp is not None and time.monotonic() - conn.last_used > self.idle_check_seconds:
+            try:
+                await conn.smtp.noop()
+            except aiosmtplib.SMTPException:
+                metrics.incr("smtp.stale")
+                conn.smtp.close()
+                conn.smtp = None
+        if conn.smtp is None:
+            await self._connect(conn)
+    
+    async def send(self, message: Message) -> None:
+        """Send one message on a pooled connection."""
+        conn = await self._idle.get()
+        try:
+            await self._ensure_healthy(conn)
+            try:
+                await conn.smtp.send_message(message)
+            except (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError):
+                # Dropped between the health check and the send: retry once
+                metrics.incr("smtp.retried")
+                conn.smtp.close()
+                await self._connect(conn)
+                await conn.smtp.send_message(message)
+            conn.last_used = time.monotonic()
+            metrics.incr("smtp.sent")
+        except Exception:
+            if conn.smtp is not None and not conn.smtp.is_connected:
+                conn.smtp = None
+            raise
+        finally:
+            self._idle.put_nowait(conn)
+    
+    async def send_batch(self, messages: List[Message]) -> List[bool]:
+        """Send many messages over the pool; returns per-message success."""
+        results = await asyncio.gather(
+            *(self.send(message) for message in messages), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                metrics.incr("smtp.failed")
+                print(f"Failed to send email: {result}")
+        return [not isinstance(result, Exception) for result in results]
+    
+    async def close(self) -> None:
+        """Close every open connection (on shutdown)."""
+        conns = []
+        while not self._idle.empty():
+            conns.append(self._idle.get_nowait())
+        for conn in conns:
+            await self._disconnect(conn)
+            self._idle.put_nowait(conn)
+
+
+smtp_pool = SmtpPool(
+    size=settings.smtp_pool_size,
+    idle_check_seconds=settings.smtp_pool_idle_check_seconds
+)
+
+
+async def send_emails(messages: List[Message]) -> List[bool]:
+    """Batch send API: deliver prepared messages over the SMTP pool."""
+    if not settings.smtp_user or not settings.smtp_password:
+        print(f"[WARNING] SMTP not configured. Skipping {len(messages)} emails")
+        return [False] * len(messages)
+    return await smtp_pool.send_batch(messages)
+
+
+# ==================== MESSAGE BUILDING ====================
+
+# Container and ASCII part headers formatted once; MIMEMultipart/MIMEText
+# would format the same headers (and pick the same charset) on every send.
+_ALTERNATIVE_HEADERS = MIMEMultipart("alternative").items()
+_ASCII_PART_HEADERS = {subtype: MIMEText("", subtype).items() for subtype in ("plain", "html")}
+
+
+def _text_part(body: str, subtype: str) -> Message:
+    if not body.isascii():
+        return MIMEText(body, subtype)
+    part = Message()
+    for name, value in _ASCII_PART_HEADERS[subtype]:
+        part[name] = value
+    part.set_payload(body)
+    return part
+
+
+def build_message(rendered: RenderedEmail, to: str) -> Message:
+    """Build the multipart/alternative message for a rendered template."""
+    message = Message()
+    for name, value in _ALTERNATIVE_HEADERS:
+        message[name] = value
+    message["Subject"] = rendered.subject
+    message["From"] = settings.email_from
+    message["To"] = to
+    message.set_payload([_text_part(rendered.text, "plain"), _text_part(rendered.html, "html")])
+    return message
 
 
 async def send_verification_email(email: str, token: str, subdomain: str) -> bool:
@@ -28,59 +178,12 @@ async def send_verification_email(email: str, token: str, subdomain: str) -> boo
         
         verification_link = f"{settings.frontend_url}/verify-email?token={token}"
         
-        message = MIMEMultipart("alternative")
-        message["Subject"] = "Verify your UIGISC account"
-        message["From"] = settings.email_from
-        message["To"] = email
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: Arial, sans-serif; background-color: #200A53; color: white; padding: 40px;">
-            <div style="max-width: 600px; margin: 0 auto; background-color: #120233; border-radius: 20px; padding: 40px; border: 1px solid #3e1e75;">
-                <h1 style="color: white; margin-bottom: 20px;">Welcome to UIGISC!</h1>
-                <p style="color: #C2A2F9; font-size: 16px; line-height: 1.6;">
-                    Thank you for registering your promo page. Your subdomain <strong>{subdomain}.uigisc.com</strong> is almost ready!
-                </p>
-                <p style="color: #C2A2F9; font-size: 16px; line-height: 1.6;">
-                    Please click the button below to verify your email address:
-                </p>
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{verification_link}" style="background: linear-gradient(90deg, #3D08AF, #432583); color: white; padding: 15px 40px; text-decoration: none; border-radius: 14px; font-size: 16px; display: inline-block;">
-                        Verify Email
-                    </a>
-                </div>
-                <p style="color: #8B8B8B; font-size: 12px;">
-                    If you didn't create this account, you can safely ignore this email.
-                </p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        text_content = f"""
-        Welcome to UIGISC!
-        
-        Thank you for registering your promo page. Your subdomain {subdomain}.uigisc.com is almost ready!
-        
-        Please verify your email by clicking this link:
-        {verification_link}
-        
-        If you didn't create this account, you can safely ignore this email.
-        """
-        
-        message.attach(MIMEText(text_content, "plain"))
-        message.attach(MIMEText(html_content, "html"))
-        
-        await aiosmtplib.send(
-            message,
-            hostname=settings.smtp_host,
-            port=settings.smtp_port,
-            username=settings.smtp_user,
-            password=settings.smtp_password,
-            start_tls=True,
+        rendered = render_email(
+            "verify_email_link", subdomain=subdomain, verification_link=verification_link
         )
         
+        await smtp_pool.send(build_message(rendered, email))
+        
         return True
     except Exception as e:
         print(f"Failed to send verification email: {e}")
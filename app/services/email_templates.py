@@ -0,0 +1,242 @@
+"""
+Email template registry.
+
+Each template (subject, plain text and HTML) is compiled once at import
+into static segments and placeholder names, so a send only joins strings.
+Placeholders are written as ${name}; values are HTML-escaped in the HTML
+part only.
+"""
+import html
+import re
+import textwrap
+from typing import Dict, List, NamedTuple
+
+_PLACEHOLDER = re.compile(r"\$\{(\w+)\}")
+
+
+class RenderedEmail(NamedTuple):
+    subject: str
+    text: str
+    html: str
+
+
+class CompiledTemplate:
+    """A template string split into static segments and placeholder names."""
+
+    __slots__ = ("_segments", "_names")
+
+    def __init__(self, source: str):
+        parts = _PLACEHOLDER.split(source)
+        # re.split alternates: static, name, static, name, ..., static
+        self._segments: List[str] = parts[0::2]
+        self._names: List[str] = parts[1::2]
+
+    def render(self, context: Dict[str, str], escape: bool = False) -> str:
+        out = [self._segments[0]]
+        for name, segment in zip(self._names, self._segments[1:]):
+            value = str(context[name])
+            out.append(html.escape(value) if escape else value)
+            out.append(segment)
+        return "".join(out)
+
+
+class EmailTemplate:
+    def __init__(self, name: str, subject: str, text: str, html_source: str):
+        self.name = name
+        self.subject = CompiledTemplate(subject)
+        self.text = CompiledTemplate(textwrap.dedent(text).strip())
+        self.html = CompiledTemplate(html_source)
+
+    def render(self, **context) -> RenderedEmail:
+        return RenderedEmail(
+            subject=self.subject.render(context),
+            text=self.text.render(context),
+            html=self.html.render(context, escape=True),
+        )
+
+
+_registry: Dict[str, EmailTemplate] = {}
+
+
+def register_template(name: str, subject: str, text: str, html_source: str) -> EmailTemplate:
+    """Compile and register a template under name."""
+    template = EmailTemplate(name, subject, text, html_source)
+    _registry[name] = template
+    return template
+
+
+def get_template(name: str) -> EmailTemplate:
+    return _registry[name]
+
+
+def render_email(name: str, **context) -> RenderedEmail:
+    """Render the subject, text and HTML parts of a registered template."""
+    return _registry[name].render(**context)
+
+
+# ==================== TEMPLATES ====================
+
+register_template(
+    "verification_code",
+    subject="Your UIGISC Verification Code",
+    text="""
+Your UIGISC Verification Code
+
+Your verification code is: ${code}
+
+This code will expire in 10 minutes.
+
+If you didn't request this code, please ignore this email.
+
+- The UIGISC Team
+                        """,
+    html_source="""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    </head>
+    <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #200A53;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
+            <div style="background: linear-gradient(135deg, #120233 0%, #1a0845 100%); border-radius: 24px; padding: 48px 40px; border: 1px solid #3e1e75; box-shadow: 0 20px 60px rgba(0, 0, 0, 0.4);">
+                
+                <!-- Logo/Brand -->
+                <div style="text-align: center; margin-bottom: 32px;">
+                    <h1 style="color: #ffffff; font-size: 28px; margin: 0; font-weight: 700; letter-spacing: -0.5px;">UIGISC</h1>
+                </div>
+                
+                <!-- Main Content -->
+                <div style="text-align: center;">
+                    <h2 style="color: #ffffff; font-size: 22px; margin: 0 0 16px 0; font-weight: 600;">Verify Your Email</h2>
+                    <p style="color: #C2A2F9; font-size: 16px; line-height: 1.6; margin: 0 0 32px 0;">
+                        Enter this code to complete your registration:
+                    </p>
+                    
+                    <!-- Verification Code Box -->
+                    <div style="background: linear-gradient(90deg, #3D08AF 0%, #432583 100%); border-radius: 16px; padding: 24px 32px; display: inline-block; margin-bottom: 32px;">
+                        <span style="color: #ffffff; font-size: 36px; font-weight: 700; letter-spacing: 8px; font-family: 'Courier New', monospace;">${code}</span>
+                    </div>
+                    
+                    <p style="color: #8B8B8B; font-size: 14px; line-height: 1.6; margin: 0;">
+                        This code will expire in <strong style="color: #C2A2F9;">10 minutes</strong>.
+                    </p>
+                </div>
+                
+                <!-- Divider -->
+                <div style="border-top: 1px solid #3e1e75; margin: 32px 0;"></div>
+                
+                <!-- Footer -->
+                <div style="text-align: center;">
+                    <p style="color: #6B6B8B; font-size: 12px; line-height: 1.6; margin: 0;">
+                        If you didn't request this code, you can safely ignore this email.
+                    </p>
+                </div>
+            </div>
+        </div>
+    </body>
+    </html>
+    """,
+)
+
+register_template(
+    "password_reset_code",
+    subject="Reset Your UIGISC Password",
+    text="""
+Reset Your UIGISC Password
+
+Your password reset code is: ${code}
+
+This code will expire in 15 minutes.
+
+If you didn't request this password reset, please ignore this email.
+
+- The UIGISC Team
+                        """,
+    html_source="""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    </head>
+    <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #200A53;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
+            <div style="background: linear-gradient(135deg, #120233 0%, #1a0845 100%); border-radius: 24px; padding: 48px 40px; border: 1px solid #3e1e75; box-shadow: 0 20px 60px rgba(0, 0, 0, 0.4);">
+                
+                <!-- Logo/Brand -->
+                <div style="text-align: center; margin-bottom: 32px;">
+                    <h1 style="color: #ffffff; font-size: 28px; margin: 0; font-weight: 700; letter-spacing: -0.5px;">UIGISC</h1>
+                </div>
+                
+                <!-- Main Content -->
+                <div style="text-align: center;">
+                    <h2 style="color: #ffffff; font-size: 22px; margin: 0 0 16px 0; font-weight: 600;">Reset Your Password</h2>
+                    <p style="color: #C2A2F9; font-size: 16px; line-height: 1.6; margin: 0 0 32px 0;">
+                        Enter this code to reset your password:
+                    </p>
+                    
+                    <!-- Reset Code Box (Red accent to differentiate) -->
+                    <div style="background: linear-gradient(90deg, #AF083D 0%, #832543 100%); border-radius: 16px; padding: 24px 32px; display: inline-block; margin-bottom: 32px;">
+                        <span style="color: #ffffff; font-size: 36px; font-weight: 700; letter-spacing: 8px; font-family: 'Courier New', monospace;">${code}</span>
+                    </div>
+                    
+                    <p style="color: #8B8B8B; font-size: 14px; line-height: 1.6; margin: 0;">
+                        This code will expire in <strong style="color: #C2A2F9;">15 minutes</strong>.
+                    </p>
+                </div>
+                
+                <!-- Divider -->
+                <div style="border-top: 1px solid #3e1e75; margin: 32px 0;"></div>
+                
+                <!-- Footer -->
+                <div style="text-align: center;">
+                    <p style="color: #6B6B8B; font-size: 12px; line-height: 1.6; margin: 0;">
+                        If you didn't request this password reset, you can safely ignore this email.
+                    </p>
+                </div>
+            </div>
+        </div>
+    </body>
+    </html>
+    """,
+)
+
+register_template(
+    "verify_email_link",
+    subject="Verify your UIGISC account",
+    text="""
+        Welcome to UIGISC!
+        
+        Thank you for registering your promo page. Your subdomain ${subdomain}.uigisc.com is almost ready!
+        
+        Please verify your email by clicking this link:
+        ${verification_link}
+        
+        If you didn't create this account, you can safely ignore this email.
+        """,
+    html_source="""
+        <!DOCTYPE html>
+        <html>
+        <body style="font-family: Arial, sans-serif; background-color: #200A53; color: white; padding: 40px;">
+            <div style="max-width: 600px; margin: 0 auto; background-color: #120233; border-radius: 20px; padding: 40px; border: 1px solid #3e1e75;">
+                <h1 style="color: white; margin-bottom: 20px;">Welcome to UIGISC!</h1>
+                <p style="color: #C2A2F9; font-size: 16px; line-height: 1.6;">
+                    Thank you for registering your promo page. Your subdomain <strong>${subdomain}.uigisc.com</strong> is almost ready!
+                </p>
+                <p style="color: #C2A2F9; font-size: 16px; line-height: 1.6;">
+                    Please click the button below to verify your email address:
+                </p>
+                <div style="text-align: center; margin: 30px 0;">
+                    <a href="${verification_link}" style="background: linear-gradient(90deg, #3D08AF, #432583); color: white; padding: 15px 40px; text-decoration: none; border-radius: 14px; font-size: 16px; display: inline-block;">
+                        Verify Email
+                    </a>
+                </div>
+                <p style="color: #8B8B8B; font-size: 12px;">
+                    If you didn't create this account, you can safely ignore this email.
+                </p>
+            </div>
+        </body>
+        </html>
+        """,
+)
@@ -0,0 +1,88 @@
+"""
+HTTP conditional GET support for public endpoints.
+
+Cached payloads carry a strong ETag (a digest of the rendered body, so every
+worker agrees on it). Requests with a matching If-None-Match get a 304
+without rendering or touching MongoDB when the payload is already cached.
+
+There is deliberately no Last-Modified: the only time each worker knows is
+when it built its copy, which differs between workers and moves on every
+cache expiry, so If-Modified-Since would miss on unchanged content.
+"""
+import hashlib
+from typing import Callable, Dict
+
+from fastapi import Request, Response
+
+from app.config import settings
+
+
+def content_digest(*parts: bytes) -> str:
+    """Short, stable digest used to build ETags."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part)
+    return h.hexdigest()[:32]
+
+
+class RenderedPayload:
+    """A pre-rendered JSON body with its validators."""
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = f'"{content_digest(body)}"'
+
+
+# Pages users edit themselves through /api/user: revalidated on every load so
+# an edit shows up as soon as the invalidation bus has fired
+USER_EDITABLE_ROUTES = {"site", "site_opportunities"}
+
+
+def _cache_control_for(route: str) -> str:
+    overrides = settings.cache_control_map
+    if route in overrides:
+        return overrides[route]
+    if route in USER_EDITABLE_ROUTES:
+        return settings.cache_control_user_sites
+    return settings.cache_control_default
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def conditional_response(
+    request: Request,
+    route: str,
+    etag: str,
+    render: Callable[[], bytes],
+) -> Response:
+    """Return 304 if the client's ETag matches, otherwise render the body."""
+    headers: Dict[str, str] = {
+        "ETag": etag,
+        "Cache-Control": _cache_control_for(route),
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=render(), media_type="application/json", headers=headers)
+
+
+def payload_response(request: Request, route: str, payload: RenderedPayload) -> Response:
+    """Conditional response for a cached RenderedPayload."""
+    return conditional_response(
+        request, route, payload.etag, lambda: payload.body
+    )
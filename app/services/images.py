@@ -0,0 +1,178 @@
+"""
+Server-side image pipeline for admin uploads.
+
+After the original is stored, raster images are re-encoded into a few
+responsive width variants (WebP by default, AVIF when Pillow supports it),
+with all metadata stripped. Decoding and encoding run in a process pool so
+they never block the event loop. The upload is handed to the pool as a temp
+file path rather than pickled bytes, and pool processes are started from a
+forkserver, never forked from the multithreaded API worker.
+"""
+import asyncio
+import io
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from app.config import settings
+from app.services.storage import get_storage_service
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = None
+
+# Formats Pillow can decode without losing anything meaningful (no SVG, and
+# GIFs are left alone so animations survive)
+PROCESSABLE_TYPES = {"image/jpeg", "image/png", "image/webp", "image/bmp", "image/tiff"}
+
+_CONTENT_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+
+
+def render_variants(
+    path: str,
+    widths: List[int],
+    formats: List[str],
+    quality: int,
+) -> List[Tuple[int, str, bytes]]:
+    """Decode an image and encode it at each width/format (runs in a worker process).
+
+    Widths larger than the original are skipped, except that the original
+    width is always produced so there is a recompressed full-size variant.
+    """
+    with Image.open(path) as source:
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+        targets = sorted({w for w in widths if w < image.width} | {image.width})
+        variants = []
+        for width in targets:
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            for fmt in formats:
+                out = io.BytesIO()
+                # No exif/icc arguments: metadata is stripped
+                resized.save(out, format=fmt.upper(), quality=quality)
+                variants.append((width, fmt, out.getvalue()))
+        return variants
+
+
+def _copy_to_temp(source) -> str:
+    """Copy an uploaded file object to a temp file the pool can open by path."""
+    source.seek(0)
+    fd, path = tempfile.mkstemp(prefix="upload-")
+    with os.fdopen(fd, "wb") as target:
+        shutil.copyfileobj(source, target)
+    return path
+
+
+def _pool_context():
+    # Forking a process that runs the event loop, executor and driver
+    # threads can copy held locks into the child; start from a clean server
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+class ImagePipeline:
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.widths = [int(w) for w in settings.image_variant_widths.split(",") if w.strip()]
+        self.formats = self._supported_formats()
+
+    @staticmethod
+    def _supported_formats() -> List[str]:
+        if Image is None:
+            return []
+        formats = []
+        for fmt in settings.image_variant_formats.split(","):
+            fmt = fmt.strip().lower()
+            if fmt == "webp" and features.check("webp"):
+                formats.append(fmt)
+            elif fmt == "avif" and features.check("avif"):
+                formats.append(fmt)
+            elif fmt:
+                print(f"[IMAGES] Pillow cannot encode {fmt}, skipping it")
+        return formats
+
+    @property
+    def enabled(self) -> bool:
+        return settings.image_variants_enabled and bool(self.formats) and bool(self.widths)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Created lazily so each gunicorn worker builds its own after fork
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=settings.image_process_workers,
+                mp_context=_pool_context()
+            )
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def create_variants(self, source, original_url: str, content_type: str) -> Optional[dict]:
+        """Build, upload and describe responsive variants of an uploaded image.
+
+        `source` is a binary file object (e.g. UploadFile.file); it is copied
+        to a temp file in a thread and the worker process reads it from disk.
+        Returns a manifest with the variant URLs and a srcset string per
+        format, or None if the image can't or shouldn't be processed.
+        """
+        if not self.enabled or content_type not in PROCESSABLE_TYPES:
+            return None
+
+        loop = asyncio.get_running_loop()
+        path = None
+        try:
+            path = await loop.run_in_executor(None, _copy_to_temp, source)
+            rendered = await loop.run_in_executor(
+                self._get_pool(),
+                render_variants,
+                path,
+                self.widths,
+                self.formats,
+                settings.image_variant_quality,
+            )
+        except Exception as e:
+            print(f"[IMAGES] Failed to process image {original_url}: {e}")
+            return None
+        finally:
+            if path is not None:
+                os.unlink(path)
+
+        # Variants live next to the original: products/{id}-{width}w.{fmt}
+        stem = os.path.splitext(original_url.rsplit("/", 1)[-1])[0]
+        uploads = [
+            get_storage_service().upload_file(
+                content,
+                f"{stem}-{width}w.{fmt}",
+                _CONTENT_TYPES[fmt],
+                key=f"products/{stem}-{width}w.{fmt}"
+            )
+            for width, fmt, content in rendered
+        ]
+        try:
+            urls = await asyncio.gather(*uploads)
+        except Exception as e:
+            print(f"[IMAGES] Failed to upload variants of {original_url}: {e}")
+            return None
+
+        variants = [
+            {"url": url, "width": width, "format": fmt, "size": len(content)}
+            for url, (width, fmt, content) in zip(urls, rendered)
+        ]
+        srcset = {
+            fmt: ", ".join(f"{v['url']} {v['width']}w" for v in variants if v["format"] == fmt)
+            for fmt in self.formats
+        }
+        return {"variants": variants, "srcset": srcset}
+
+
+image_pipeline = ImagePipeline()
@@ -0,0 +1,144 @@
+"""
+Cross-worker cache invalidation bus.
+
+Gunicorn runs several workers, each with its own PublicCache. Admin write
+paths call notify_change(), which invalidates the local cache and publishes
+the topic so every other worker drops its copy too.
+
+Backends (settings.cache_invalidation_backend):
+- "local": no broadcast, other workers rely on the cache TTL
+- "mongo_poll": events are written to a shared collection and polled
+- "change_stream": same collection, pushed through a MongoDB change stream
+  (requires a replica set; falls back to polling otherwise)
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from app.config import settings
+from app.database import get_database
+from app.services.cache import public_cache
+
+EVENTS_COLLECTION = "cache_invalidations"
+
+
+class InvalidationBus:
+    """Local-only bus: invalidations never leave this worker."""
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, topic: str) -> None:
+        pass
+
+
+class MongoPollingBus(InvalidationBus):
+    """Broadcast invalidations through a shared MongoDB collection."""
+
+    # Extra look-back on every poll to tolerate clock skew between hosts
+    SKEW_MARGIN = timedelta(seconds=5)
+
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self.origin = uuid.uuid4().hex
+        self._task: Optional[asyncio.Task] = None
+        self._seen: Dict[object, datetime] = {}
+        self._since = datetime.utcnow()
+
+    async def start(self) -> None:
+        self._since = datetime.utcnow()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def publish(self, topic: str) -> None:
+        db = get_database()
+        try:
+            await db[EVENTS_COLLECTION].insert_one({
+                "topic": topic,
+                "origin": self.origin,
+                "at": datetime.utcnow(),
+            })
+        except Exception as e:
+            # Other workers will catch up when their cache TTL expires
+            print(f"[CACHE] Failed to publish invalidation for {topic}: {e}")
+
+    def _apply(self, event: dict) -> None:
+        if event["_id"] in self._seen:
+            return
+        self._seen[event["_id"]] = event["at"]
+        if event.get("origin") != self.origin:
+            public_cache.invalidate(event["topic"])
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[CACHE] Invalidation poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _poll(self) -> None:
+        db = get_database()
+        now = datetime.utcnow()
+        lookback = self._since - self.SKEW_MARGIN
+
+        cursor = db[EVENTS_COLLECTION].find({"at": {"$gte": lookback}}).sort("at", 1)
+        async for event in cursor:
+            self._apply(event)
+
+        self._since = now
+        self._seen = {k: v for k, v in self._seen.items() if v >= lookback}
+
+
+class MongoChangeStreamBus(MongoPollingBus):
+    """Receive invalidations pushed by a change stream on the events collection."""
+
+    async def _run(self) -> None:
+        db = get_database()
+        pipeline = [{"$match": {"operationType": "insert"}}]
+
+        while True:
+            try:
+                async with db[EVENTS_COLLECTION].watch(pipeline) as stream:
+                    # Anything published while the stream was down is caught
+                    # by one poll after (re)connecting.
+                    await self._poll()
+                    async for change in stream:
+                        self._apply(change["fullDocument"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[CACHE] Change stream unavailable ({e}), falling back to polling")
+                await MongoPollingBus._run(self)
+
+
+def _create_bus() -> InvalidationBus:
+    backend = settings.cache_invalidation_backend
+    if backend == "mongo_poll":
+        return MongoPollingBus(settings.cache_invalidation_poll_seconds)
+    if backend == "change_stream":
+        return MongoChangeStreamBus(settings.cache_invalidation_poll_seconds)
+    return InvalidationBus()
+
+
+invalidation_bus = _create_bus()
+
+
+async def notify_change(topic: str) -> None:
+    """Invalidate topic in this worker and broadcast it to the others."""
+    public_cache.invalidate(topic)
+    await invalidation_bus.publish(topic)
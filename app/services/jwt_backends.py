@@ -0,0 +1,149 @@
+"""
+Interchangeable JWT implementations for access tokens.
+
+All backends sign and verify standard compact HS* JWTs with the same
+secret, so tokens issued by one are accepted by the others and the
+backend can be switched (JWT_BACKEND) without logging anyone out.
+
+- "jose": python-jose (the original implementation)
+- "pyjwt": PyJWT, if installed
+- "hmac": minimal HS256/HS384/HS512 encoder/verifier on the stdlib
+"""
+import base64
+import calendar
+import hashlib
+import hmac
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+
+class TokenError(Exception):
+    """Raised when a token is malformed, badly signed or expired."""
+    pass
+
+
+class JoseBackend:
+    name = "jose"
+
+    def __init__(self, secret_key: str, algorithm: str):
+        from jose import jwt, JWTError
+        self._jwt = jwt
+        self._error = JWTError
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        return self._jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        try:
+            return self._jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except self._error as e:
+            raise TokenError(str(e))
+
+
+class PyJWTBackend:
+    name = "pyjwt"
+
+    def __init__(self, secret_key: str, algorithm: str):
+        import jwt
+        self._jwt = jwt
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        return self._jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        try:
+            return self._jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except self._jwt.PyJWTError as e:
+            raise TokenError(str(e))
+
+
+class HmacBackend:
+    """Stdlib HS* JWTs: checks the signature, alg, exp and nbf only."""
+    name = "hmac"
+
+    _DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+    def __init__(self, secret_key: str, algorithm: str):
+        if algorithm not in self._DIGESTS:
+            raise ValueError(f"hmac JWT backend does not support {algorithm}")
+        self.secret_key = secret_key.encode("utf-8")
+        self.algorithm = algorithm
+        self._digest = self._DIGESTS[algorithm]
+        header = {"alg": algorithm, "typ": "JWT"}
+        self._header = self._b64encode(json.dumps(header, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+
+    @staticmethod
+    def _b64encode(data: bytes) -> bytes:
+        return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+    @staticmethod
+    def _b64decode(data: bytes) -> bytes:
+        return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        return hmac.new(self.secret_key, signing_input, self._digest).digest()
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        claims = dict(claims)
+        for claim in ("exp", "iat", "nbf"):
+            if isinstance(claims.get(claim), datetime):
+                claims[claim] = calendar.timegm(claims[claim].utctimetuple())
+
+        payload = self._b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+        signing_input = self._header + b"." + payload
+        return (signing_input + b"." + self._b64encode(self._sign(signing_input))).decode("ascii")
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        try:
+            signing_input, signature = token.encode("ascii").rsplit(b".", 1)
+            header_segment, payload_segment = signing_input.split(b".")
+            if not hmac.compare_digest(self._b64decode(signature), self._sign(signing_input)):
+                raise TokenError("Signature verification failed")
+
+            header = json.loads(self._b64decode(header_segment))
+            if header.get("alg") != self.algorithm:
+                raise TokenError("The specified alg value is not allowed")
+            claims = json.loads(self._b64decode(payload_segment))
+        except TokenError:
+            raise
+        except (ValueError, UnicodeError) as e:
+            raise TokenError(f"Invalid token: {e}")
+
+        if not isinstance(claims, dict):
+            raise TokenError("Invalid payload")
+
+        now = time.time()
+        try:
+            if "exp" in claims and now > int(claims["exp"]):
+                raise TokenError("Signature has expired")
+            if "nbf" in claims and now < int(claims["nbf"]):
+                raise TokenError("The token is not yet valid")
+        except (TypeError, ValueError):
+            raise TokenError("Invalid time claim")
+        return claims
+
+
+_BACKENDS = {
+    "jose": JoseBackend,
+    "pyjwt": PyJWTBackend,
+    "hmac": HmacBackend,
+}
+
+
+def get_jwt_backend(name: str, secret_key: str, algorithm: str):
+    """Build the configured backend, falling back to jose if it can't load."""
+    backend_class = _BACKENDS.get(name)
+    if backend_class is None:
+        print(f"[AUTH] Unknown JWT backend '{name}', using jose")
+        return JoseBackend(secret_key, algorithm)
+    try:
+        return backend_class(secret_key, algorithm)
+    except (ImportError, ValueError) as e:
+        print(f"[AUTH] JWT backend '{name}' unavailable ({e}), using jose")
+        return JoseBackend(secret_key, algorithm)
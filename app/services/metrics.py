@@ -0,0 +1,48 @@
+"""
+Lightweight in-process metrics (per worker).
+
+Counters, gauges and timings are kept in memory and exposed through
+GET /api/admin/metrics. Safe to update from worker threads.
+"""
+import os
+import threading
+from typing import Dict
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, float] = {}
+        self._timings: Dict[str, Dict[str, float]] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        """Increment a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def gauge(self, name: str, value: float) -> None:
+        """Set a gauge to its current value."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a duration."""
+        with self._lock:
+            timing = self._timings.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+            timing["count"] += 1
+            timing["total"] += seconds
+            timing["max"] = max(timing["max"], seconds)
+
+    def snapshot(self) -> dict:
+        """Return a copy of every metric for this worker."""
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "timings": {name: dict(t) for name, t in self._timings.items()},
+            }
+
+
+metrics = Metrics()
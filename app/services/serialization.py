@@ -0,0 +1,37 @@
+"""
+Pre-rendered JSON payloads for cached public responses.
+"""
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+
+from app.config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def render_json(content: Any) -> bytes:
+    """Render content exactly as FastAPI's default JSONResponse would.
+    
+    In fast JSON mode content is already JSON-native (built by the public
+    helpers in app/models), so jsonable_encoder is skipped and orjson is used
+    when installed. Both paths produce the same bytes.
+    """
+    if settings.fast_json_responses:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+    
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
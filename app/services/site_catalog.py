@@ -0,0 +1,134 @@
+"""
+Two-layer rendering for user site opportunities.
+
+The active catalog is rendered to JSON once (CatalogBase). Each site's
+customizations are compiled into a sparse overlay of button link overrides,
+and responses are produced by splicing that overlay into the base bytes.
+"""
+from typing import Dict, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+from app.services.http_cache import content_digest
+from app.services.serialization import render_json
+
+PRIMARY = 0
+SECONDARY = 1
+
+_DEFAULT_BUTTON_TEXT = ("Join Now", "Learn More")
+_BUTTON_SLOTS = {"primary_button": PRIMARY, "secondary_button": SECONDARY}
+
+
+class SiteOverlay:
+    """Sparse (opportunity id, button slot, link) overrides for one site."""
+
+    __slots__ = ("links", "digest")
+
+    def __init__(self, links: Tuple[Tuple[str, int, str], ...]):
+        self.links = links
+        self.digest = content_digest(repr(links).encode("utf-8"))
+
+
+class CatalogBase:
+    """Immutable, pre-rendered opportunity catalog."""
+
+    def __init__(self, items: List[Union[BaseModel, dict]]):
+        self.index: Dict[str, int] = {}
+        self.buttons: List[Tuple[Optional[dict], Optional[dict]]] = []
+        self.items: List[bytes] = []
+        # Each item's JSON split around its buttons: (segments, slots), where
+        # the item is segments[0] + button(slots[0]) + segments[1] + ...
+        self._parts: List[Tuple[List[bytes], List[int]]] = []
+
+        for i, item in enumerate(items):
+            data = item.model_dump(mode="json") if isinstance(item, BaseModel) else item
+            self._parts.append(self._split(data))
+            self.index[data["id"]] = i
+            self.buttons.append((data["primary_button"], data["secondary_button"]))
+            self.items.append(render_json(data))
+
+        self.body = b"[" + b",".join(self.items) + b"]"
+        self.digest = content_digest(self.body)
+
+    @staticmethod
+    def _split(data: dict) -> Tuple[List[bytes], List[int]]:
+        """Pre-render an item's fields in their own order, leaving the buttons open.
+
+        Makes no assumption about where the buttons are in the schema.
+        """
+        missing = [field for field in _BUTTON_SLOTS if field not in data]
+        if missing:
+            raise ValueError(f"Opportunity {data.get('id')} has no {', '.join(missing)} field to override")
+
+        segments = [b"{"]
+        slots = []
+        for n, (key, value) in enumerate(data.items()):
+            separator = b"," if n else b""
+            if key in _BUTTON_SLOTS:
+                segments[-1] += separator + render_json(key) + b":"
+                slots.append(_BUTTON_SLOTS[key])
+                segments.append(b"")
+            else:
+                # {"key":value} without the braces
+                segments[-1] += separator + render_json({key: value})[1:-1]
+        segments[-1] += b"}"
+        return segments, slots
+
+    def _render_item(self, i: int, links: Dict[int, str]) -> bytes:
+        segments, slots = self._parts[i]
+        rendered = [segments[0]]
+        for slot, segment in zip(slots, segments[1:]):
+            button = self.buttons[i][slot]
+            if slot in links:
+                if button:
+                    button = {**button, "link": links[slot]}
+                else:
+                    button = {"text": _DEFAULT_BUTTON_TEXT[slot], "link": links[slot], "type": "link"}
+            rendered.append(render_json(button))
+            rendered.append(segment)
+        return b"".join(rendered)
+
+    def render(self, overlay: SiteOverlay) -> bytes:
+        """Render the catalog with a site's overlay spliced in."""
+        if not overlay.links:
+            return self.body
+
+        overrides: Dict[int, Dict[int, str]] = {}
+        for opp_id, slot, link in overlay.links:
+            i = self.index.get(opp_id)
+            if i is not None:
+                overrides.setdefault(i, {})[slot] = link
+
+        if not overrides:
+            return self.body
+
+        items = list(self.items)
+        for i, links in overrides.items():
+            items[i] = self._render_item(i, links)
+        return b"[" + b",".join(items) + b"]"
+
+
+def compile_overlay(customizations: Dict[str, str]) -> SiteOverlay:
+    """Compile a website's customizations map into a sparse overlay.
+
+    Keys are {opp_id}_primary, {opp_id}_secondary or the legacy {opp_id}
+    (primary). Empty links are ignored, and {opp_id}_primary wins over the
+    legacy key.
+    """
+    primary: Dict[str, str] = {}
+    legacy: Dict[str, str] = {}
+    secondary: Dict[str, str] = {}
+
+    for key, link in customizations.items():
+        if not link:
+            continue
+        if key.endswith("_primary"):
+            primary[key[:-8]] = link
+        elif key.endswith("_secondary"):
+            secondary[key[:-10]] = link
+        else:
+            legacy[key] = link
+
+    overlay = [(opp_id, PRIMARY, link) for opp_id, link in {**legacy, **primary}.items()]
+    overlay.extend((opp_id, SECONDARY, link) for opp_id, link in secondary.items())
+    return SiteOverlay(tuple(sorted(overlay)))
@@ -1,22 +1,33 @@
 """
 AWS SNS/SES Email Service for verification codes and password reset.
 """
+import asyncio
+import functools
 import random
 import string
+import time
 import traceback
-from datetime import datetime, timedelta
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
+from botocore.exceptions import (
+    ClientError, NoCredentialsError, PartialCredentialsError, EndpointConnectionError
+)
 
 from app.config import settings
+from app.services.metrics import metrics
+from app.services.email_templates import render_email
+from app.services.code_store import (
+    code_store, CODE_MISSING, CODE_EXPIRED, CODE_TOO_MANY_ATTEMPTS, CODE_INVALID
+)
 
-# In-memory store for verification codes (consider Redis for production scale)
-verification_codes: Dict[str, dict] = {}
+# Code kinds in the shared code store
+VERIFICATION = "verification"
+PASSWORD_RESET = "password_reset"
 
-# Separate store for password reset codes
-password_reset_codes: Dict[str, dict] = {}
+VERIFICATION_CODE_TTL = 10 * 60
+PASSWORD_RESET_CODE_TTL = 15 * 60
+MAX_CODE_ATTEMPTS = 5
 
 
 def generate_verification_code(length: int = 6) -> str:
@@ -38,8 +49,22 @@ def debug_config():
     print("=" * 60)
 
 
+_config_logged = False
+
+
+def _log_config_once():
+    """Print the AWS configuration the first time an email is sent."""
+    global _config_logged
+    if not _config_logged:
+        _config_logged = True
+        debug_config()
+
+
+@functools.lru_cache()
 def get_ses_client():
-    """Get boto3 SES client configured with AWS credentials."""
+    """Get boto3 SES client configured with AWS credentials (created once, thread-safe)."""
+    import boto3
+    
     return boto3.client(
         'ses',
         aws_access_key_id=settings.aws_access_key_id,
@@ -48,6 +73,148 @@ def get_ses_client():
     )
 
 
+def _send_email(message: dict) -> dict:
+    # Runs on the sender thread pool, so the first call's boto3 import and
+    # client setup stay off the event loop
+    return get_ses_client().send_email(**message)
+
+
+# ==================== SES SENDER ====================
+
+# SES errors worth retrying: throttling and transient service failures
+RETRYABLE_SES_ERRORS = {
+    "Throttling", "ThrottlingException", "TooManyRequestsException",
+    "ServiceUnavailable", "InternalFailure", "RequestTimeout",
+}
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, EndpointConnectionError):
+        return True
+    if isinstance(error, ClientError):
+        return error.response['Error']['Code'] in RETRYABLE_SES_ERRORS
+    return False
+
+
+class SesSender:
+    """Sends SES emails off the event loop.
+    
+    boto3 calls run on a small thread pool and are spaced to stay under
+    SES_MAX_SEND_RATE (per worker). In "queue" mode messages go to an
+    in-process queue drained by worker tasks with jittered retries, so the
+    request returns without waiting for SES. If the queue is full the
+    message is sent inline instead.
+    """
+    
+    def __init__(self, mode: str, workers: int, max_queue: int, max_rate: float, max_retries: int):
+        self.mode = mode
+        self.max_rate = max_rate
+        self.max_retries = max_retries
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ses")
+        self._workers = workers
+        self._max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._next_slot = 0.0
+    
+    async def start(self) -> None:
+        if self.mode != "queue":
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_queue)
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self._workers)]
+    
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        if self._queue is not None and self._queue.qsize():
+            print(f"[AWS SES] Dropping {self._queue.qsize()} queued emails on shutdown")
+        self._queue = None
+    
+    async def _wait_for_slot(self) -> None:
+        """Space sends out to respect the SES send rate."""
+        if self.max_rate <= 0:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1.0 / self.max_rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+    
+    async def send_now(self, **message) -> dict:
+        """Send one email through SES and return its response."""
+        await self._wait_for_slot()
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self._executor, _send_email, message)
+        finally:
+            metrics.observe("ses.send.seconds", time.perf_counter() - start)
+    
+    async def deliver(self, label: str, **message) -> dict:
+        """Send or enqueue an email depending on SES_SEND_MODE.
+        
+        Returns the SES response when sent inline, or {} when queued.
+        Inline sends raise boto3 errors to the caller.
+        """
+        if self._queue is not None:
+            try:
+                self._queue.put_nowait((label, message))
+                metrics.incr("ses.queued")
+                metrics.gauge("ses.queue_depth", self._queue.qsize())
+                return {}
+            except asyncio.QueueFull:
+                metrics.incr("ses.queue_full")
+                print(f"[AWS SES] Queue full, sending {label} inline")
+        
+        response = await self.send_now(**message)
+        metrics.incr("ses.sent")
+        return response
+    
+    async def _run(self) -> None:
+        while True:
+            label, message = await self._queue.get()
+            metrics.gauge("ses.queue_depth", self._queue.qsize())
+            try:
+                await self._send_with_retries(label, message)
+            finally:
+                self._queue.task_done()
+    
+    async def _send_with_retries(self, label: str, message: dict) -> None:
+        recipient = message['Destination']['ToAddresses'][0]
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.send_now(**message)
+                metrics.incr("ses.sent")
+                print(f"[AWS SES SUCCESS] {label} sent to {recipient} (MessageId: {response.get('MessageId')})")
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt < self.max_retries and _is_retryable(e):
+                    metrics.incr("ses.retries")
+                    # Exponential backoff with full jitter
+                    await asyncio.sleep(random.uniform(0, 0.5 * 2 ** attempt))
+                    continue
+                metrics.incr("ses.failed")
+                print(f"[AWS SES ERROR] Failed to send {label} to {recipient}: {type(e).__name__}: {e}")
+                return
+
+
+ses_sender = SesSender(
+    mode=settings.ses_send_mode,
+    workers=settings.ses_send_workers,
+    max_queue=settings.ses_queue_max_size,
+    max_rate=settings.ses_max_send_rate,
+    max_retries=settings.ses_max_retries
+)
+
+
 async def send_verification_code_email(email: str) -> dict:
     """
     Send a verification code to the user's email using AWS SES.
@@ -55,8 +222,7 @@ async def send_verification_code_email(email: str) -> dict:
     Returns:
         dict with 'success' boolean and 'message' or 'error' string
     """
-    # Debug: Print configuration
-    debug_config()
+    _log_config_once()
     print(f"[AWS SES DEBUG] Attempting to send verification code to: {email}")
     
     try:
@@ -65,11 +231,7 @@ async def send_verification_code_email(email: str) -> dict:
         print(f"[AWS SES DEBUG] Generated code: {code}")
         
         # Store code with 10-minute expiry
-        verification_codes[email.lower()] = {
-            'code': code,
-            'expires_at': datetime.utcnow() + timedelta(minutes=10),
-            'attempts': 0
-        }
+        await code_store.put(VERIFICATION, email.lower(), code, VERIFICATION_CODE_TTL)
         
         # Check environment
         print(f"[AWS SES DEBUG] Current environment: '{settings.environment}'")
@@ -90,51 +252,35 @@ async def send_verification_code_email(email: str) -> dict:
                 'error': 'Email service not configured. Please contact support.'
             }
         
-        print(f"[AWS SES DEBUG] Configuration OK, preparing to send email...")
-        print(f"[AWS SES DEBUG] From: {settings.ses_sender_email}")
-        print(f"[AWS SES DEBUG] To: {email}")
-        print(f"[AWS SES DEBUG] Region: {settings.aws_region}")
+        rendered = render_email("verification_code", code=code)
         
-        # Create SES client
-        ses_client = get_ses_client()
-        
-        # Send email
-        response = ses_client.send_email(
+        # Send email (or queue it, depending on SES_SEND_MODE)
+        response = await ses_sender.deliver(
+            "Verification code",
             Source=settings.ses_sender_email,
             Destination={
                 'ToAddresses': [email]
             },
             Message={
                 'Subject': {
-                    'Data': 'Your UIGISC Verification Code',
+                    'Data': rendered.subject,
                     'Charset': 'UTF-8'
                 },
                 'Body': {
                     'Text': {
-                        'Data': f"""
-Your UIGISC Verification Code
-
-Your verification code is: {code}
-
-This code will expire in 10 minutes.
-
-If you didn't request this code, please ignore this email.
-
-- The UIGISC Team
-                        """.strip(),
+                        'Data': rendered.text,
                         'Charset': 'UTF-8'
                     },
                     'Html': {
-                        'Data': get_verification_html_email(code),
+                        'Data': rendered.html,
                         'Charset': 'UTF-8'
                     }
                 }
             }
         )
         
-        print(f"[AWS SES DEBUG] Response: {response}")
-        print(f"[AWS SES DEBUG] MessageId: {response.get('MessageId')}")
-        print(f"[AWS SES SUCCESS] Verification code sent to {email}")
+        if response:
+            print(f"[AWS SES SUCCESS] Verification code sent to {email} (MessageId: {response.get('MessageId')})")
         
         return {
             'success': True,
@@ -175,68 +321,58 @@ If you didn't request this code, please ignore this email.
         }
 
 
-def verify_code(email: str, code: str) -> dict:
+async def verify_code(email: str, code: str) -> dict:
     """
     Verify the code entered by the user.
     
     Returns:
         dict with 'valid' boolean and 'message' string
     """
-    email_lower = email.lower()
+    outcome, remaining = await code_store.check(
+        VERIFICATION, email.lower(), code, MAX_CODE_ATTEMPTS, consume=True
+    )
     
-    if email_lower not in verification_codes:
+    if outcome == CODE_MISSING:
         return {
             'valid': False,
             'message': 'No verification code found. Please request a new code.'
         }
     
-    stored = verification_codes[email_lower]
-    
-    # Check if expired
-    if datetime.utcnow() > stored['expires_at']:
-        del verification_codes[email_lower]
+    if outcome == CODE_EXPIRED:
         return {
             'valid': False,
             'message': 'Verification code has expired. Please request a new code.'
         }
     
-    # Check attempts (max 5 attempts)
-    if stored['attempts'] >= 5:
-        del verification_codes[email_lower]
+    if outcome == CODE_TOO_MANY_ATTEMPTS:
         return {
             'valid': False,
             'message': 'Too many failed attempts. Please request a new code.'
         }
     
-    # Verify code
-    if stored['code'] != code:
-        stored['attempts'] += 1
-        remaining = 5 - stored['attempts']
+    if outcome == CODE_INVALID:
         return {
             'valid': False,
             'message': f'Invalid code. {remaining} attempts remaining.'
         }
     
-    # Success - remove the code
-    del verification_codes[email_lower]
+    # Success - the code was removed by the check
     return {
         'valid': True,
         'message': 'Email verified successfully'
     }
 
 
-def is_email_verified(email: str) -> bool:
+async def is_email_verified(email: str) -> bool:
     """
     Check if the email has been verified (code no longer in store after successful verification).
     """
-    return email.lower() not in verification_codes
+    return not await code_store.exists(VERIFICATION, email.lower())
 
 
-def clear_verification_code(email: str) -> None:
+async def clear_verification_code(email: str) -> None:
     """Clear verification code for an email (e.g., after successful registration)."""
-    email_lower = email.lower()
-    if email_lower in verification_codes:
-        del verification_codes[email_lower]
+    await code_store.delete(VERIFICATION, email.lower())
 
 
 # ==================== PASSWORD RESET FUNCTIONS ====================
@@ -248,8 +384,7 @@ async def send_password_reset_code_email(email: str) -> dict:
     Returns:
         dict with 'success' boolean and 'message' or 'error' string
     """
-    # Debug: Print configuration
-    debug_config()
+    _log_config_once()
     print(f"[AWS SES DEBUG] Attempting to send password reset code to: {email}")
     
     try:
@@ -258,12 +393,7 @@ async def send_password_reset_code_email(email: str) -> dict:
         print(f"[AWS SES DEBUG] Generated reset code: {code}")
         
         # Store code with 15-minute expiry (longer for password reset)
-        password_reset_codes[email.lower()] = {
-            'code': code,
-            'expires_at': datetime.utcnow() + timedelta(minutes=15),
-            'attempts': 0,
-            'verified': False
-        }
+        await code_store.put(PASSWORD_RESET, email.lower(), code, PASSWORD_RESET_CODE_TTL)
         
         # Check environment
         print(f"[AWS SES DEBUG] Current environment: '{settings.environment}'")
@@ -276,47 +406,35 @@ async def send_password_reset_code_email(email: str) -> dict:
                 'error': 'Email service not configured. Please contact support.'
             }
         
-        print(f"[AWS SES DEBUG] Configuration OK, preparing to send password reset email...")
-        
-        # Create SES client
-        ses_client = get_ses_client()
+        rendered = render_email("password_reset_code", code=code)
         
-        # Send email
-        response = ses_client.send_email(
+        # Send email (or queue it, depending on SES_SEND_MODE)
+        response = await ses_sender.deliver(
+            "Password reset code",
             Source=settings.ses_sender_email,
             Destination={
                 'ToAddresses': [email]
             },
             Message={
                 'Subject': {
-                    'Data': 'Reset Your UIGISC Password',
+                    'Data': rendered.subject,
                     'Charset': 'UTF-8'
                 },
                 'Body': {
                     'Text': {
-                        'Data': f"""
-Reset Your UIGISC Password
-
-Your password reset code is: {code}
-
-This code will expire in 15 minutes.
-
-If you didn't request this password reset, please ignore this email.
-
-- The UIGISC Team
-                        """.strip(),
+                        'Data': rendered.text,
                         'Charset': 'UTF-8'
                     },
                     'Html': {
-                        'Data': get_password_reset_html_email(code),
+                        'Data': rendered.html,
                         'Charset': 'UTF-8'
                     }
                 }
             }
         )
         
-        print(f"[AWS SES DEBUG] Response: {response}")
-        print(f"[AWS SES SUCCESS] Password reset code sent to {email}")
+        if response:
+            print(f"[AWS SES SUCCESS] Password reset code sent to {email} (MessageId: {response.get('MessageId')})")
         
         return {
             'success': True,
@@ -341,181 +459,68 @@ If you didn't request this password reset, please ignore this email.
         }
 
 
-def verify_password_reset_code(email: str, code: str) -> dict:
+async def verify_password_reset_code(email: str, code: str) -> dict:
     """
     Verify the password reset code entered by the user.
     
     Returns:
         dict with 'valid' boolean and 'message' string
     """
-    email_lower = email.lower()
+    # On success the code is only marked verified (needed for password reset)
+    outcome, remaining = await code_store.check(
+        PASSWORD_RESET, email.lower(), code, MAX_CODE_ATTEMPTS, consume=False
+    )
     
-    if email_lower not in password_reset_codes:
+    if outcome == CODE_MISSING:
         return {
             'valid': False,
             'message': 'No password reset code found. Please request a new code.'
         }
     
-    stored = password_reset_codes[email_lower]
-    
-    # Check if expired
-    if datetime.utcnow() > stored['expires_at']:
-        del password_reset_codes[email_lower]
+    if outcome == CODE_EXPIRED:
         return {
             'valid': False,
             'message': 'Password reset code has expired. Please request a new code.'
         }
     
-    # Check attempts (max 5 attempts)
-    if stored['attempts'] >= 5:
-        del password_reset_codes[email_lower]
+    if outcome == CODE_TOO_MANY_ATTEMPTS:
         return {
             'valid': False,
             'message': 'Too many failed attempts. Please request a new code.'
         }
     
-    # Verify code
-    if stored['code'] != code:
-        stored['attempts'] += 1
-        remaining = 5 - stored['attempts']
+    if outcome == CODE_INVALID:
         return {
             'valid': False,
             'message': f'Invalid code. {remaining} attempts remaining.'
         }
     
-    # Success - mark as verified but don't remove yet (needed for password reset)
-    stored['verified'] = True
     return {
         'valid': True,
         'message': 'Code verified successfully. You can now reset your password.'
     }
 
 
-def is_reset_code_verified(email: str) -> bool:
+async def is_reset_code_verified(email: str) -> bool:
     """
     Check if the password reset code has been verified for this email.
     """
-    email_lower = email.lower()
-    if email_lower not in password_reset_codes:
-        return False
-    
-    stored = password_reset_codes[email_lower]
-    
-    # Check if expired
-    if datetime.utcnow() > stored['expires_at']:
-        del password_reset_codes[email_lower]
-        return False
-    
-    return stored.get('verified', False)
+    return await code_store.is_verified(PASSWORD_RESET, email.lower())
 
 
-def clear_password_reset_code(email: str) -> None:
+async def clear_password_reset_code(email: str) -> None:
     """Clear password reset code for an email (after successful password reset)."""
-    email_lower = email.lower()
-    if email_lower in password_reset_codes:
-        del password_reset_codes[email_lower]
+    await code_store.delete(PASSWORD_RESET, email.lower())
 
 
 # ==================== HTML EMAIL TEMPLATES ====================
+# Templates live in app/services/email_templates.py, compiled once at import.
 
 def get_verification_html_email(code: str) -> str:
     """Generate HTML email template for verification code."""
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    </head>
-    <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #200A53;">
-        <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
-            <div style="background: linear-gradient(135deg, #120233 0%, #1a0845 100%); border-radius: 24px; padding: 48px 40px; border: 1px solid #3e1e75; box-shadow: 0 20px 60px rgba(0, 0, 0, 0.4);">
-                
-                <!-- Logo/Brand -->
-                <div style="text-align: center; margin-bottom: 32px;">
-                    <h1 style="color: #ffffff; font-size: 28px; margin: 0; font-weight: 700; letter-spacing: -0.5px;">UIGISC</h1>
-                </div>
-                
-                <!-- Main Content -->
-                <div style="text-align: center;">
-                    <h2 style="color: #ffffff; font-size: 22px; margin: 0 0 16px 0; font-weight: 600;">Verify Your Email</h2>
-                    <p style="color: #C2A2F9; font-size: 16px; line-height: 1.6; margin: 0 0 32px 0;">
-                        Enter this code to complete your registration:
-                    </p>
-                    
-                    <!-- Verification Code Box -->
-                    <div style="background: linear-gradient(90deg, #3D08AF 0%, #432583 100%); border-radius: 16px; padding: 24px 32px; display: inline-block; margin-bottom: 32px;">
-                        <span style="color: #ffffff; font-size: 36px; font-weight: 700; letter-spacing: 8px; font-family: 'Courier New', monospace;">{code}</span>
-                    </div>
-                    
-                    <p style="color: #8B8B8B; font-size: 14px; line-height: 1.6; margin: 0;">
-                        This code will expire in <strong style="color: #C2A2F9;">10 minutes</strong>.
-                    </p>
-                </div>
-                
-                <!-- Divider -->
-                <div style="border-top: 1px solid #3e1e75; margin: 32px 0;"></div>
-                
-                <!-- Footer -->
-                <div style="text-align: center;">
-                    <p style="color: #6B6B8B; font-size: 12px; line-height: 1.6; margin: 0;">
-                        If you didn't request this code, you can safely ignore this email.
-                    </p>
-                </div>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    return render_email("verification_code", code=code).html
 
 
 def get_password_reset_html_email(code: str) -> str:
     """Generate HTML email template for password reset."""
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    </head>
-    <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #200A53;">
-        <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
-            <div style="background: linear-gradient(135deg, #120233 0%, #1a0845 100%); border-radius: 24px; padding: 48px 40px; border: 1px solid #3e1e75; box-shadow: 0 20px 60px rgba(0, 0, 0, 0.4);">
-                
-                <!-- Logo/Brand -->
-                <div style="text-align: center; margin-bottom: 32px;">
-                    <h1 style="color: #ffffff; font-size: 28px; margin: 0; font-weight: 700; letter-spacing: -0.5px;">UIGISC</h1>
-                </div>
-                
-                <!-- Main Content -->
-                <div style="text-align: center;">
-                    <h2 style="color: #ffffff; font-size: 22px; margin: 0 0 16px 0; font-weight: 600;">Reset Your Password</h2>
-                    <p style="color: #C2A2F9; font-size: 16px; line-height: 1.6; margin: 0 0 32px 0;">
-                        Enter this code to reset your password:
-                    </p>
-                    
-                    <!-- Reset Code Box (Red accent to differentiate) -->
-                    <div style="background: linear-gradient(90deg, #AF083D 0%, #832543 100%); border-radius: 16px; padding: 24px 32px; display: inline-block; margin-bottom: 32px;">
-                        <span style="color: #ffffff; font-size: 36px; font-weight: 700; letter-spacing: 8px; font-family: 'Courier New', monospace;">{code}</span>
-                    </div>
-                    
-                    <p style="color: #8B8B8B; font-size: 14px; line-height: 1.6; margin: 0;">
-                        This code will expire in <strong style="color: #C2A2F9;">15 minutes</strong>.
-                    </p>
-                </div>
-                
-                <!-- Divider -->
-                <div style="border-top: 1px solid #3e1e75; margin: 32px 0;"></div>
-                
-                <!-- Footer -->
-                <div style="text-align: center;">
-                    <p style="color: #6B6B8B; font-size: 12px; line-height: 1.6; margin: 0;">
-                        If you didn't request this password reset, you can safely ignore this email.
-                    </p>
-                </div>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
-
+    return render_email("password_reset_code", code=code).html
@@ -1,12 +1,68 @@
-import boto3
+import asyncio
+import functools
+import hashlib
+import itertools
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional
+
 from botocore.exceptions import ClientError
 from app.config import settings
+from app.database import get_database
+from app.models.upload import upload_helper
+from app.services.metrics import metrics
 import uuid
 import os
 import io
 
+# Browser uploads can't be verified against a digest, so they are kept out of
+# the content-addressed products/{sha256} namespace
+DIRECT_UPLOAD_PREFIX = "products/direct/"
+_DIRECT_KEY_PATTERN = re.compile(re.escape(DIRECT_UPLOAD_PREFIX) + r"[0-9a-f]{32}(\.[a-z0-9]+)?")
+
+
+class UploadTooLargeError(Exception):
+    """Raised when a streamed upload exceeds the configured max size."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"File exceeds the maximum upload size of {max_size // (1024 * 1024)} MB")
+
+
 class StorageService:
     def __init__(self):
+        self.bucket = settings.do_bucket
+        self.cdn_base = self._cdn_base(settings.do_endpoint)
+        self._client = None
+        self._client_lock = threading.Lock()
+
+        self.verify_mode = settings.storage_verify_mode
+        self._upload_counter = itertools.count(1)
+        self._deferred_checks = set()
+
+        # boto3 is blocking: run it on a small dedicated pool so uploads never
+        # stall the event loop, and cap concurrent uploads per worker so a batch
+        # of large images can't starve public traffic.
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.storage_max_concurrent_uploads,
+            thread_name_prefix="storage"
+        )
+        self._upload_slots = asyncio.Semaphore(settings.storage_max_concurrent_uploads)
+
+    @property
+    def client(self):
+        """S3 client for Spaces, created (and boto3 imported) on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    def _create_client(self):
+        import boto3
+
         # Extract region from endpoint if possible (e.g., https://nyc3.digitaloceanspaces.com)
         endpoint = settings.do_endpoint
         region = 'nyc3'  # default
@@ -25,21 +81,271 @@ class StorageService:
                 pass
 
         print(f"Initializing StorageService with region: {region}, endpoint: {endpoint}, bucket: {settings.do_bucket}")
-        self.session = boto3.session.Session()
-        self.client = self.session.client(
+        session = boto3.session.Session()
+        return session.client(
             's3',
             region_name=region,
             endpoint_url=endpoint,
             aws_access_key_id=settings.do_access_key,
             aws_secret_access_key=settings.do_secret
         )
-        self.bucket = settings.do_bucket
 
-    async def upload_file(self, file_content: bytes, filename: str, content_type: str) -> str:
-        """Uploads a file to DO Spaces and returns the public URL."""
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking boto3 call on the storage thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def _call(self, method: str, **kwargs):
+        """Call an S3 client method on the storage thread pool.
+
+        The client is looked up in the worker thread, so its first use (which
+        imports boto3 and builds the client) never runs on the event loop.
+        """
+        return await self._run(lambda: getattr(self.client, method)(**kwargs))
+
+    async def upload_file(self, file_content: bytes, filename: str, content_type: str, key: Optional[str] = None) -> str:
+        """Uploads a file to DO Spaces and returns the public URL.
+
+        A random key under products/ is generated unless `key` is given.
+        """
+        async with self._upload_slots:
+            unique_filename = await self._run(self._upload_file_sync, file_content, filename, content_type, key)
+        await self._after_upload(unique_filename)
+
+        url = self._public_url(unique_filename)
+        print(f"Generated CDN URL: {url}")
+        return url
+
+    async def upload_stream(self, stream, filename: str, content_type: str) -> dict:
+        """Store an upload, deduplicated by content, and return its upload record.
+
+        `stream` is any object with async `read(size)` and `seek(offset)`
+        (e.g. FastAPI's UploadFile). It is first hashed in one pass over the
+        local spool, which also enforces the max size before anything is
+        sent. If the digest is already in the `uploads` index the existing
+        record is returned without a PUT; otherwise the content is stored at
+        the immutable key products/{sha256}{ext}. Only one part is held in
+        memory at a time; files larger than a single part go through an S3
+        multipart upload. The record has "deduplicated" set accordingly.
+        """
+        part_size = max(settings.storage_part_size_mb, 5) * 1024 * 1024
+        max_size = settings.storage_max_upload_mb * 1024 * 1024
+
+        digest, size = await self._hash_stream(stream, part_size, max_size)
+
+        db = get_database()
+        existing = await db.uploads.find_one({"_id": digest})
+        if existing:
+            metrics.incr("storage.dedup.hits")
+            print(f"Upload {filename} matches existing object {existing['key']}, skipping PUT")
+            return {**upload_helper(existing), "deduplicated": True}
+
+        unique_filename = self.content_key(digest, filename)
+        await stream.seek(0)
+
+        async with self._upload_slots:
+            chunk = await stream.read(part_size)
+
+            try:
+                print(f"Uploading {unique_filename} to bucket {self.bucket}...")
+                if len(chunk) < part_size:
+                    # Small file: a single PUT
+                    await self._call(
+                        "put_object",
+                        Bucket=self.bucket,
+                        Key=unique_filename,
+                        Body=chunk,
+                        ACL='public-read',
+                        ContentType=content_type,
+                        CacheControl=settings.storage_cache_control
+                    )
+                else:
+                    await self._upload_multipart(stream, chunk, unique_filename, content_type, part_size, max_size)
+            except ClientError as e:
+                print(f"Error uploading to DO Spaces: {e}")
+                raise Exception(f"Failed to upload file: {str(e)}")
+
+        await self._after_upload(unique_filename)
+
+        url = self._public_url(unique_filename)
+        print(f"Generated CDN URL: {url}")
+
+        upload_doc = {
+            "_id": digest,
+            "url": url,
+            "key": unique_filename,
+            "size": size,
+            "content_type": content_type,
+            "created_at": datetime.utcnow(),
+        }
+        # Concurrent identical uploads write the same key; first record wins
+        await db.uploads.update_one({"_id": digest}, {"$setOnInsert": upload_doc}, upsert=True)
+        metrics.incr("storage.dedup.misses")
+
+        return {**upload_helper(upload_doc), "deduplicated": False}
+
+    async def presign_upload(self, filename: str, content_type: str, size: int) -> dict:
+        """Issue a short-lived presigned POST for a browser-to-Spaces upload.
+
+        The storage service can't verify a client-declared checksum on a
+        POST, so direct uploads never enter the content-addressed namespace
+        or the `uploads` index: each one gets a random key under
+        DIRECT_UPLOAD_PREFIX. The policy pins the key, content type, ACL and
+        cache headers and caps the size at the declared size.
+        """
+        max_size = settings.storage_max_upload_mb * 1024 * 1024
+        if size > max_size:
+            raise UploadTooLargeError(max_size)
+
+        key = self.direct_key(filename)
+        expires_in = settings.storage_presign_expires_seconds
+        fields = {
+            "acl": "public-read",
+            "Content-Type": content_type,
+            "Cache-Control": settings.storage_cache_control,
+        }
+        conditions = [
+            {"acl": "public-read"},
+            {"Content-Type": content_type},
+            {"Cache-Control": settings.storage_cache_control},
+            ["content-length-range", 1, size],
+        ]
+        # Signing is local (no network round trip), but the first call may
+        # still have to import boto3 and build the client
+        presigned = await self._call(
+            "generate_presigned_post",
+            Bucket=self.bucket,
+            Key=key,
+            Fields=fields,
+            Conditions=conditions,
+            ExpiresIn=expires_in
+        )
+        metrics.incr("storage.presigned")
+        return {
+            "url": self._public_url(key),
+            "key": key,
+            "upload_url": presigned["url"],
+            "fields": presigned["fields"],
+            "expires_in": expires_in,
+        }
+
+    async def complete_presigned_upload(self, key: str) -> Optional[dict]:
+        """Confirm a finished direct upload and describe the stored object.
+
+        Returns None if the object isn't in the bucket (the upload never
+        finished or the policy rejected it).
+        """
+        try:
+            head = await self._call("head_object", Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            print(f"Direct upload {key} not found: {e}")
+            return None
+
+        metrics.incr("storage.uploads")
+        return {
+            "url": self._public_url(key),
+            "key": key,
+            "size": head.get("ContentLength", 0),
+            "content_type": head.get("ContentType", ""),
+        }
+
+    @staticmethod
+    def direct_key(filename: str) -> str:
+        """Random object key for a browser upload."""
+        ext = os.path.splitext(filename)[1].lower()
+        if not re.fullmatch(r"\.[a-z0-9]+", ext):
+            ext = ""
+        return f"{DIRECT_UPLOAD_PREFIX}{uuid.uuid4().hex}{ext}"
+
+    @staticmethod
+    def is_direct_key(key: str) -> bool:
+        """Check that a key has the shape issued by direct_key()."""
+        return _DIRECT_KEY_PATTERN.fullmatch(key) is not None
+
+    @staticmethod
+    def content_key(digest: str, filename: str) -> str:
+        """Immutable, content-addressed object key."""
+        ext = os.path.splitext(filename)[1].lower()
+        return f"products/{digest}{ext}"
+
+    async def save_variants(self, digest: str, manifest: dict) -> None:
+        """Store an image variant manifest on its upload record."""
+        db = get_database()
+        await db.uploads.update_one(
+            {"_id": digest},
+            {"$set": {"variants": manifest["variants"], "srcset": manifest["srcset"]}}
+        )
+
+    async def _hash_stream(self, stream, part_size: int, max_size: int):
+        """SHA-256 and size of a stream, read one part at a time."""
+        digest = hashlib.sha256()
+        size = 0
+        while True:
+            chunk = await stream.read(part_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_size:
+                raise UploadTooLargeError(max_size)
+            # hashlib releases the GIL on large buffers
+            await self._run(digest.update, chunk)
+        return digest.hexdigest(), size
+
+    async def _upload_multipart(self, stream, chunk: bytes, key: str, content_type: str, part_size: int, max_size: int):
+        mpu = await self._call(
+            "create_multipart_upload",
+            Bucket=self.bucket,
+            Key=key,
+            ACL='public-read',
+            ContentType=content_type,
+            CacheControl=settings.storage_cache_control
+        )
+        upload_id = mpu['UploadId']
+        parts = []
+        total = 0
+
+        try:
+            while chunk:
+                total += len(chunk)
+                if total > max_size:
+                    raise UploadTooLargeError(max_size)
+
+                part_number = len(parts) + 1
+                response = await self._call(
+                    "upload_part",
+                    Bucket=self.bucket,
+                    Key=key,
+                    PartNumber=part_number,
+                    UploadId=upload_id,
+                    Body=chunk
+                )
+                parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+                chunk = await stream.read(part_size)
+
+            await self._call(
+                "complete_multipart_upload",
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': parts}
+            )
+        except BaseException:
+            await self._call(
+                "abort_multipart_upload",
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id
+            )
+            raise
+
+    def _new_key(self, filename: str) -> str:
         # Clean filename and add unique prefix
         ext = os.path.splitext(filename)[1]
-        unique_filename = f"products/{uuid.uuid4()}{ext}"
+        return f"products/{uuid.uuid4()}{ext}"
+
+    def _upload_file_sync(self, file_content: bytes, filename: str, content_type: str, key: Optional[str] = None) -> str:
+        """Blocking single upload; returns the object key."""
+        unique_filename = key or self._new_key(filename)
 
         try:
             print(f"Uploading {unique_filename} to bucket {self.bucket}...")
@@ -51,60 +357,101 @@ class StorageService:
                 unique_filename,
                 ExtraArgs={
                     'ACL': 'public-read',
-                    'ContentType': content_type
+                    'ContentType': content_type,
+                    'CacheControl': settings.storage_cache_control
                 }
             )
-            
-            # Verify upload and check ACL
-            try:
-                self.client.head_object(Bucket=self.bucket, Key=unique_filename)
-                print(f"Successfully verified upload of {unique_filename}")
-                
-                # Check ACL specifically
-                acl = self.client.get_object_acl(Bucket=self.bucket, Key=unique_filename)
-                print(f"Object ACL for {unique_filename}: {acl.get('Grants')}")
-                
-                # Verify public-read grant exists
-                public_read_exists = any(
-                    grant.get('Grantee', {}).get('URI') == 'http://acs.amazonaws.com/groups/global/AllUsers' and
-                    grant.get('Permission') in ['READ', 'FULL_CONTROL']
-                    for grant in acl.get('Grants', [])
-                )
-                if public_read_exists:
-                    print(f"CONFIRMED: {unique_filename} has public-read permissions.")
-                else:
-                    print(f"WARNING: {unique_filename} does NOT appear to have public-read permissions in its ACL!")
-                    
-            except Exception as e:
-                print(f"Verification FAILED for {unique_filename}: {e}")
-                raise Exception(f"Upload verification failed: {str(e)}")
-
-            # Construct the CDN URL in format: https://{bucket}.{region}.cdn.digitaloceanspaces.com/{bucket}/{key}
-            endpoint = settings.do_endpoint.rstrip('/')
-            
-            # Extract region from endpoint (e.g., "sfo3" from "https://sfo3.digitaloceanspaces.com")
-            region = 'sfo3'  # default
-            if '://' in endpoint:
-                host = endpoint.split('://')[1]
-                # Parse region from endpoint formats like:
-                # - https://sfo3.digitaloceanspaces.com
-                # - https://bucket.sfo3.digitaloceanspaces.com
-                parts = host.split('.')
-                if 'digitaloceanspaces' in host:
-                    for i, part in enumerate(parts):
-                        if part == 'digitaloceanspaces':
-                            # The region is the part right before 'digitaloceanspaces'
-                            if i > 0:
-                                region = parts[i - 1]
-                            break
-            
-            # Build CDN URL: https://{bucket}.{region}.cdn.digitaloceanspaces.com/{bucket}/{key}
-            url = f"https://{self.bucket}.{region}.cdn.digitaloceanspaces.com/{self.bucket}/{unique_filename}"
-            
-            print(f"Generated CDN URL: {url}")
-            return url
+            return unique_filename
         except ClientError as e:
             print(f"Error uploading to DO Spaces: {e}")
             raise Exception(f"Failed to upload file: {str(e)}")
 
-storage_service = StorageService()
+    async def _after_upload(self, unique_filename: str) -> None:
+        """Apply the post-upload verification policy (STORAGE_VERIFY_MODE).
+
+        - "always": verify every upload before returning
+        - "sampled": verify 1 in STORAGE_VERIFY_SAMPLE_RATE uploads
+        - "deferred": verify in a background task, reported through metrics
+        - "off": skip the extra HEAD/ACL round trips entirely
+        """
+        metrics.incr("storage.uploads")
+        mode = self.verify_mode
+
+        if mode == "always":
+            await self._run(self._verify_upload, unique_filename)
+        elif mode == "sampled":
+            if next(self._upload_counter) % max(settings.storage_verify_sample_rate, 1) == 0:
+                await self._run(self._verify_upload, unique_filename)
+        elif mode == "deferred":
+            task = asyncio.create_task(self._verify_deferred(unique_filename))
+            self._deferred_checks.add(task)
+            task.add_done_callback(self._deferred_checks.discard)
+
+    async def _verify_deferred(self, unique_filename: str) -> None:
+        try:
+            await self._run(self._verify_upload, unique_filename)
+        except Exception:
+            # Already counted and logged by _verify_upload
+            pass
+
+    def _verify_upload(self, unique_filename: str) -> None:
+        """Verify upload and check ACL."""
+        metrics.incr("storage.verify.checked")
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=unique_filename)
+            print(f"Successfully verified upload of {unique_filename}")
+            
+            # Check ACL specifically
+            acl = self.client.get_object_acl(Bucket=self.bucket, Key=unique_filename)
+            print(f"Object ACL for {unique_filename}: {acl.get('Grants')}")
+            
+            # Verify public-read grant exists
+            public_read_exists = any(
+                grant.get('Grantee', {}).get('URI') == 'http://acs.amazonaws.com/groups/global/AllUsers' and
+                grant.get('Permission') in ['READ', 'FULL_CONTROL']
+                for grant in acl.get('Grants', [])
+            )
+            if public_read_exists:
+                print(f"CONFIRMED: {unique_filename} has public-read permissions.")
+            else:
+                metrics.incr("storage.verify.not_public")
+                print(f"WARNING: {unique_filename} does NOT appear to have public-read permissions in its ACL!")
+                
+        except Exception as e:
+            metrics.incr("storage.verify.failed")
+            print(f"Verification FAILED for {unique_filename}: {e}")
+            raise Exception(f"Upload verification failed: {str(e)}")
+
+    @staticmethod
+    def _cdn_base(endpoint: str) -> str:
+        """Parse the CDN base URL from the endpoint once, at startup."""
+        # Construct the CDN URL in format: https://{bucket}.{region}.cdn.digitaloceanspaces.com/{bucket}/{key}
+        endpoint = endpoint.rstrip('/')
+        bucket = settings.do_bucket
+        
+        # Extract region from endpoint (e.g., "sfo3" from "https://sfo3.digitaloceanspaces.com")
+        region = 'sfo3'  # default
+        if '://' in endpoint:
+            host = endpoint.split('://')[1]
+            # Parse region from endpoint formats like:
+            # - https://sfo3.digitaloceanspaces.com
+            # - https://bucket.sfo3.digitaloceanspaces.com
+            parts = host.split('.')
+            if 'digitaloceanspaces' in host:
+                for i, part in enumerate(parts):
+                    if part == 'digitaloceanspaces':
+                        # The region is the part right before 'digitaloceanspaces'
+                        if i > 0:
+                            region = parts[i - 1]
+                        break
+        
+        return f"https://{bucket}.{region}.cdn.digitaloceanspaces.com/{bucket}"
+
+    def _public_url(self, unique_filename: str) -> str:
+        return f"{self.cdn_base}/{unique_filename}"
+
+
+@functools.lru_cache()
+def get_storage_service() -> StorageService:
+    """Get the per-process StorageService (created on first use)."""
+    return StorageService()
@@ -0,0 +1,75 @@
+"""
+Batch-render verification emails: template rendering alone, and the full
+message built with MIMEMultipart/MIMEText per send vs. from the prepared
+headers in app.services.email.build_message.
+
+- render:    render_email only (subject, text and HTML)
+- mime:      render + MIMEMultipart and two MIMEText parts per message
+- prepared:  render + build_message
+
+--flatten also serializes every message (as aiosmtplib does on send).
+
+Usage (from the repository root):
+    python scripts/bench_email_templates.py [--number 10000] [--flatten]
+"""
+import argparse
+import os
+import sys
+import timeit
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.services.email import build_message  # noqa: E402
+from app.services.email_templates import render_email  # noqa: E402
+
+
+def _mime_per_send(rendered, to):
+    message = MIMEMultipart("alternative")
+    message["Subject"] = rendered.subject
+    message["From"] = settings.email_from
+    message["To"] = to
+    message.attach(MIMEText(rendered.text, "plain"))
+    message.attach(MIMEText(rendered.html, "html"))
+    return message
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=10000, help="Messages per batch")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements; the best one is reported")
+    parser.add_argument("--flatten", action="store_true", help="Also serialize each message to bytes")
+    args = parser.parse_args()
+
+    recipients = [
+        (f"user{i}@example.com", f"site{i}", f"{settings.frontend_url}/verify-email?token=token-{i:08d}")
+        for i in range(args.number)
+    ]
+
+    def render(to, subdomain, link):
+        return render_email("verify_email_link", subdomain=subdomain, verification_link=link)
+
+    def mime(to, subdomain, link):
+        return _mime_per_send(render(to, subdomain, link), to)
+
+    def prepared(to, subdomain, link):
+        return build_message(render(to, subdomain, link), to)
+
+    modes = [("render", render), ("mime", mime), ("prepared", prepared)]
+    if args.flatten:
+        modes += [
+            ("mime+flatten", lambda *r: mime(*r).as_bytes()),
+            ("prepared+flatten", lambda *r: prepared(*r).as_bytes()),
+        ]
+
+    print(f"verify_email_link, batches of {args.number} messages")
+    print(f"{'mode':<18} {'ms/batch':>10} {'µs/msg':>10}")
+    for name, build in modes:
+        best = min(timeit.repeat(lambda: [build(*r) for r in recipients], number=1, repeat=args.repeat))
+        print(f"{name:<18} {best * 1e3:>10.1f} {best / args.number * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measure worker import time with `python -X importtime`.
+
+Imports a module (app.main by default) in a fresh interpreter, then reports
+its cumulative import time, the slowest imports, and whether boto3 was
+pulled in at startup (it should only load on first storage/SES use; only
+botocore.exceptions is needed up front, for except clauses).
+
+Usage (from the repository root):
+    python scripts/bench_importtime.py [--module app.main] [--top 15] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(module: str) -> dict:
+    """Cumulative import time (µs) of each module imported in one interpreter run."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--runs", type=int, default=5, help="Interpreter runs; the median is reported")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    total = statistics.median(run[args.module] for run in runs)
+    print(f"import {args.module}: {total / 1000:.1f} ms (median of {args.runs})")
+
+    last = runs[-1]
+    print("\nSlowest imports (cumulative, last run):")
+    for name, cumulative in sorted(last.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    print()
+    if "botocore.exceptions" in last:
+        print(f"botocore.exceptions: {last['botocore.exceptions'] / 1000:.1f} ms")
+    if "boto3" in last:
+        print(f"WARNING: boto3 imported at startup ({last['boto3'] / 1000:.1f} ms)")
+    else:
+        print("boto3 not imported at startup")
+
+
+if __name__ == "__main__":
+    main()
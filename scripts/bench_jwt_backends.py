@@ -0,0 +1,50 @@
+"""
+Compare encode/decode throughput of the JWT backends (JWT_BACKEND).
+
+Usage (from the repository root):
+    python scripts/bench_jwt_backends.py [--number 20000] [--algorithm HS256]
+
+Backends that are not installed are skipped.
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.jwt_backends import HmacBackend, JoseBackend, PyJWTBackend  # noqa: E402
+
+SECRET = "benchmark-secret-key"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000, help="Operations per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements; the best one is reported")
+    parser.add_argument("--algorithm", default="HS256", choices=["HS256", "HS384", "HS512"])
+    args = parser.parse_args()
+
+    claims = {
+        "sub": "admin@example.com",
+        "role": "admin",
+        "exp": datetime.utcnow() + timedelta(hours=1),
+    }
+
+    print(f"{'backend':<8} {'encode µs':>10} {'decode µs':>10}")
+    for backend_class in (JoseBackend, PyJWTBackend, HmacBackend):
+        try:
+            backend = backend_class(SECRET, args.algorithm)
+        except ImportError:
+            print(f"{backend_class.name:<8} {'not installed':>21}")
+            continue
+
+        token = backend.encode(claims)
+        encode = min(timeit.repeat(lambda: backend.encode(claims), number=args.number, repeat=args.repeat))
+        decode = min(timeit.repeat(lambda: backend.decode(token), number=args.number, repeat=args.repeat))
+        print(f"{backend.name:<8} {encode / args.number * 1e6:>10.2f} {decode / args.number * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Per-request auth overhead of decode_access_token with and without the
+verified token cache (TOKEN_CACHE_MAX_ENTRIES / TOKEN_CACHE_TTL_SECONDS).
+
+- disabled: cache off (TOKEN_CACHE_MAX_ENTRIES=0), every call verifies the JWT
+- cold:     a different token per call, so every call misses and is cached
+- warm:     the same token again, as on the dozens of calls behind one
+            admin dashboard page
+
+Usage (from the repository root):
+    python scripts/bench_token_cache.py [--number 20000] [--backend jose]
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.services import auth  # noqa: E402
+from app.services.auth import VerifiedTokenCache  # noqa: E402
+from app.services.jwt_backends import get_jwt_backend  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000, help="Calls per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements; the best one is reported")
+    parser.add_argument("--backend", default=settings.jwt_backend, choices=["jose", "pyjwt", "hmac"])
+    args = parser.parse_args()
+
+    auth.jwt_backend = get_jwt_backend(args.backend, settings.secret_key, settings.algorithm)
+    expire = datetime.utcnow() + timedelta(hours=1)
+    tokens = [
+        auth.jwt_backend.encode({"sub": f"user-{i}", "email": f"user{i}@example.com", "role": "admin", "exp": expire})
+        for i in range(args.number)
+    ]
+
+    def disabled():
+        auth.token_cache = VerifiedTokenCache(max_entries=0, ttl_seconds=settings.token_cache_ttl_seconds)
+        return timeit.timeit(lambda: auth.decode_access_token(tokens[0]), number=args.number)
+
+    def cold():
+        auth.token_cache = VerifiedTokenCache(max_entries=args.number, ttl_seconds=settings.token_cache_ttl_seconds)
+        return timeit.timeit(lambda: [auth.decode_access_token(token) for token in tokens], number=1)
+
+    def warm():
+        auth.token_cache = VerifiedTokenCache(max_entries=args.number, ttl_seconds=settings.token_cache_ttl_seconds)
+        auth.decode_access_token(tokens[0])
+        return timeit.timeit(lambda: auth.decode_access_token(tokens[0]), number=args.number)
+
+    print(f"decode_access_token, {auth.jwt_backend.name} backend")
+    print(f"{'cache':<10} {'µs/call':>10}")
+    results = {}
+    for name, measure in (("disabled", disabled), ("cold", cold), ("warm", warm)):
+        results[name] = min(measure() for _ in range(args.repeat)) / args.number * 1e6
+        print(f"{name:<10} {results[name]:>10.2f}")
+    print(f"\nwarm hit is {results['disabled'] / results['warm']:.1f}x faster than verifying")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+In-memory test doubles.
+
+FakeDatabase is a tiny in-memory stand-in for the Motor collections the
+public routes read (equality filters, projections, sort and async
+iteration), so responses can be rendered from fixture documents without a
+MongoDB server.
+"""
+from typing import Dict, List, Optional
+
+
+def _matches(doc: dict, query: Optional[dict]) -> bool:
+    return all(doc.get(key) == value for key, value in (query or {}).items())
+
+
+def _sort_key(value):
+    # None sorts first, like MongoDB
+    return (value is not None, value)
+
+
+class FakeCursor:
+    def __init__(self, docs: List[dict]):
+        self._docs = docs
+
+    def sort(self, key_or_list, direction: int = 1) -> "FakeCursor":
+        keys = key_or_list if isinstance(key_or_list, list) else [(key_or_list, direction)]
+        # Stable sorts applied from the least significant key
+        for key, order in reversed(keys):
+            self._docs.sort(key=lambda d: _sort_key(d.get(key)), reverse=order < 0)
+        return self
+
+    def __aiter__(self):
+        self._iter = iter(self._docs)
+        return self
+
+    async def __anext__(self) -> dict:
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeCollection:
+    def __init__(self, docs: List[dict]):
+        self.docs = docs
+
+    @staticmethod
+    def _project(doc: dict, projection: Optional[dict]) -> dict:
+        if not projection:
+            return dict(doc)
+        return {k: v for k, v in doc.items() if k == "_id" or projection.get(k)}
+
+    def find(self, query: Optional[dict] = None, projection: Optional[dict] = None) -> FakeCursor:
+        return FakeCursor([self._project(d, projection) for d in self.docs if _matches(d, query)])
+
+    async def find_one(self, query: Optional[dict] = None, projection: Optional[dict] = None) -> Optional[dict]:
+        for doc in self.docs:
+            if _matches(doc, query):
+                return self._project(doc, projection)
+        return None
+
+
+class FakeDatabase:
+    def __init__(self, collections: Dict[str, List[dict]]):
+        self._collections = {name: FakeCollection(docs) for name, docs in collections.items()}
+
+    def __getattr__(self, name: str) -> FakeCollection:
+        return self._collections.setdefault(name, FakeCollection([]))
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        return getattr(self, name)
+
@@ -0,0 +1,175 @@
+"""
+Fixture documents for the public endpoint tests, with fixed ObjectIds so the
+rendered responses can be compared against committed golden output.
+
+Kept free of app imports so the same fixtures can be rendered by older
+revisions of the handlers when the golden file is regenerated.
+"""
+from datetime import datetime
+
+from bson import ObjectId
+
+OPP_FULL = ObjectId("65a000000000000000000001")
+OPP_MINIMAL = ObjectId("65a000000000000000000002")
+OPP_UNICODE = ObjectId("65a000000000000000000003")
+CATEGORY = ObjectId("65a000000000000000000004")
+CATEGORY_INACTIVE = ObjectId("65a000000000000000000005")
+
+FIXTURES = {
+    "users": [
+        {"_id": ObjectId("65a000000000000000000012"), "email": "alice@example.com", "subdomain": "alice"},
+    ],
+    "opportunities": [
+        {
+            "_id": OPP_FULL,
+            "name": "Bitnest",
+            "image": "https://cdn.example.com/products/bitnest.png",
+            "description": "Line one\nLine two\twith a tab and a \"quote\" and a \\ backslash",
+            "videos": [
+                {"title": "Intro", "vimeo_id": "1030432292", "extra": "dropped"},
+                {"title": "Deep dive", "vimeo_id": "1030432293"},
+            ],
+            "bottom_description": "Control chars: \x00\x01\x1f\x7f end",
+            "telegram_link": "https://t.me/bitnest",
+            "primary_button": {"text": "Join Now", "link": "https://join.example.com/?a=1&b=2"},
+            "secondary_button": {"text": "Learn More", "link": "https://learn.example.com", "type": "copy"},
+            "status": "active",
+            "is_featured": True,
+            "order": 1,
+            "created_at": datetime(2024, 1, 2, 3, 4, 5, 123456),
+        },
+        {
+            # Only the required fields
+            "_id": OPP_MINIMAL,
+            "name": "Minimal",
+            "status": "active",
+            "order": 0,
+        },
+        {
+            "_id": OPP_UNICODE,
+            "name": "Ünïcødé ✓ 日本語 🚀",
+            "description": "Emoji 👩‍👩‍👧 and RTL עברית and   line separator",
+            "videos": [],
+            "primary_button": None,
+            "secondary_button": {"text": "Mehr erfahren", "link": "https://example.de/über"},
+            "status": "active",
+            "order": 2,
+        },
+        {
+            "_id": ObjectId("65a000000000000000000006"),
+            "name": "Hidden",
+            "status": "unpublished",
+            "order": 3,
+        },
+    ],
+    "websites": [
+        {
+            "_id": ObjectId("65a000000000000000000007"),
+            "subdomain": "alice",
+            "status": "active",
+            "customizations": {
+                f"{OPP_FULL}_primary": "https://alice.example.com/join",
+                f"{OPP_FULL}_secondary": "",
+                f"{OPP_MINIMAL}": "https://alice.example.com/legacy",
+                f"{OPP_UNICODE}_secondary": "https://alice.example.com/ünï",
+            },
+        },
+        {"_id": ObjectId("65a000000000000000000008"), "subdomain": "bob", "status": "active"},
+        {"_id": ObjectId("65a000000000000000000009"), "subdomain": "carol", "status": "pending", "customizations": {}},
+    ],
+    "site_settings": [
+        {
+            "_id": ObjectId("65a00000000000000000000a"),
+            "hero_video_url": "https://vimeo.com/123",
+            "partners": [
+                {"id": "p2", "image_url": "https://cdn.example.com/p2.png", "name": "Zweiter", "order": 2},
+                {"id": "p1", "image_url": "https://cdn.example.com/p1.png", "link": "https://p1.example.com", "order": 1},
+                {"id": "p3", "image_url": "https://cdn.example.com/p3.png"},
+            ],
+            "social_links": {"facebook": "https://facebook.com/uigisc", "unknown": "dropped"},
+        },
+    ],
+    "news_media": [
+        {
+            "_id": ObjectId("65a00000000000000000000b"),
+            "vimeo_url": "https://vimeo.com/1",
+            "title": "Older 📰",
+            "status": "active",
+            "created_at": datetime(2024, 1, 1),
+        },
+        {
+            "_id": ObjectId("65a00000000000000000000c"),
+            "vimeo_url": "https://vimeo.com/2",
+            "title": "Newer <b>html</b> & more",
+            "read_more_text": "Read more",
+            "read_more_url": "https://example.com/news?id=2",
+            "is_featured": True,
+            "order": 5,
+            "status": "active",
+            "created_at": datetime(2024, 6, 1),
+        },
+        {"_id": ObjectId("65a00000000000000000000d"), "title": "Draft", "status": "draft", "created_at": datetime(2024, 7, 1)},
+    ],
+    "event_categories": [
+        {"_id": CATEGORY, "name": "Konferenz ✓", "order": 1, "status": "active"},
+        {"_id": CATEGORY_INACTIVE, "name": "Old", "order": 0, "status": "inactive"},
+    ],
+    "event_highlights": [
+        {
+            "_id": ObjectId("65a00000000000000000000e"),
+            "vimeo_url": "https://vimeo.com/3",
+            "title": "Keynote",
+            "category_id": str(CATEGORY),
+            "duration": "12:34",
+            "order": 1,
+            "status": "active",
+            "created_at": datetime(2024, 2, 1),
+        },
+        {
+            "_id": ObjectId("65a00000000000000000000f"),
+            "title": "Same order, newer",
+            "category_id": str(CATEGORY),
+            "order": 1,
+            "status": "active",
+            "created_at": datetime(2024, 3, 1),
+        },
+        {
+            "_id": ObjectId("65a000000000000000000010"),
+            "title": "Inactive category",
+            "category_id": str(CATEGORY_INACTIVE),
+            "order": 0,
+            "status": "active",
+        },
+    ],
+    "page_content": [
+        {
+            "_id": ObjectId("65a000000000000000000011"),
+            "section_key": "hero_section",
+            "content": {
+                "title": "Grow together — 1/3 Rule",
+                "stats": [{"label": "members\n", "value": 300000, "ratio": 0.1}],
+                "flags": {"visible": True, "badge": None},
+            },
+        },
+    ],
+}
+
+PATHS = [
+    "/api/opportunities",
+    "/api/check-subdomain/alice",
+    "/api/check-subdomain/fresh",
+    "/api/site/alice",
+    "/api/site/bob",
+    "/api/site/carol",
+    "/api/site/alice/opportunities",
+    "/api/site/bob/opportunities",
+    "/api/site/nobody/opportunities",
+    "/api/site-settings",
+    "/api/news-media",
+    "/api/event-categories",
+    "/api/event-highlights",
+    f"/api/event-highlights?category_id={CATEGORY}",
+    "/api/page-content/hero_section",
+    "/api/page-content/add_section",
+    "/api/page-content/unknown_section",
+]
@@ -0,0 +1,177 @@
+"""
+Direct (presigned POST) uploads against a moto S3 bucket: the policy pins
+the key, content type, ACL and size, /upload/complete only confirms objects
+that exist, and only keys issued by direct_key() are accepted.
+
+The S3 tests are skipped when moto is not installed. moto stores presigned
+POSTs without evaluating their policy, so uploads are checked against the
+signed policy the way Spaces/S3 evaluate it before they are sent.
+"""
+import base64
+import json
+
+import httpx
+import pytest
+import pytest_asyncio
+import requests
+
+from app.config import settings
+from app.main import app
+from app.middleware.auth import get_admin_user
+from app.routes import admin
+from app.schemas.user import TokenData
+from app.services.storage import DIRECT_UPLOAD_PREFIX, StorageService, UploadTooLargeError
+
+BUCKET = "direct-uploads-test"
+SHA256 = "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    moto = pytest.importorskip("moto")
+    import boto3
+
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+        monkeypatch.setenv(name, "testing")
+    monkeypatch.setattr(settings, "dospace_endpoint", "https://nyc3.digitaloceanspaces.com")
+    monkeypatch.setattr(settings, "dospace_bucket_name", BUCKET)
+
+    with moto.mock_aws():
+        service = StorageService()
+        service._client = boto3.client("s3", region_name="us-east-1")
+        service.client.create_bucket(Bucket=BUCKET)
+        monkeypatch.setattr(admin, "get_storage_service", lambda: service)
+        yield service
+
+
+@pytest_asyncio.fixture
+async def client(storage):
+    app.dependency_overrides[get_admin_user] = lambda: TokenData(user_id="admin", role="admin")
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_admin_user, None)
+
+
+def _policy(presigned: dict) -> dict:
+    return json.loads(base64.b64decode(presigned["fields"]["policy"]))
+
+
+def _policy_allows(policy: dict, form: dict, size: int) -> bool:
+    """Evaluate exact-match and content-length-range conditions like S3."""
+    for condition in policy["conditions"]:
+        if isinstance(condition, dict):
+            (name, value), = condition.items()
+            if name == "bucket":
+                continue
+            if form.get(name) != value:
+                return False
+        elif condition[0] == "content-length-range":
+            if not condition[1] <= size <= condition[2]:
+                return False
+    return True
+
+
+def _post(presigned: dict, body: bytes) -> requests.Response:
+    return requests.post(
+        presigned["upload_url"], data=presigned["fields"], files={"file": ("photo.png", body)}
+    )
+
+
+@pytest.mark.asyncio
+async def test_policy_pins_key_content_type_and_acl(storage):
+    presigned = await storage.presign_upload("Photo.PNG", "image/png", 1024)
+
+    key = presigned["key"]
+    conditions = _policy(presigned)["conditions"]
+    assert storage.is_direct_key(key) and key.endswith(".png")
+    assert presigned["fields"]["key"] == key
+    assert {"bucket": BUCKET} in conditions
+    assert {"key": key} in conditions
+    assert {"acl": "public-read"} in conditions
+    assert {"Content-Type": "image/png"} in conditions
+    assert {"Cache-Control": settings.storage_cache_control} in conditions
+    assert ["content-length-range", 1, 1024] in conditions
+
+
+@pytest.mark.asyncio
+async def test_upload_outside_policy_is_rejected(storage):
+    presigned = await storage.presign_upload("photo.png", "image/png", 1024)
+    policy = _policy(presigned)
+    fields = presigned["fields"]
+
+    assert _policy_allows(policy, fields, 1024)
+    assert not _policy_allows(policy, fields, 1025)
+    assert not _policy_allows(policy, fields, 0)
+    assert not _policy_allows(policy, {**fields, "key": DIRECT_UPLOAD_PREFIX + "0" * 32 + ".png"}, 1024)
+    assert not _policy_allows(policy, {**fields, "Content-Type": "text/html"}, 1024)
+    assert not _policy_allows(policy, {**fields, "acl": "public-read-write"}, 1024)
+
+    with pytest.raises(UploadTooLargeError):
+        await storage.presign_upload("huge.png", "image/png", settings.storage_max_upload_mb * 1024 * 1024 + 1)
+
+
+@pytest.mark.asyncio
+async def test_presign_upload_complete_round_trip(storage, client):
+    response = await client.post(
+        "/api/admin/upload/presign", json={"filename": "photo.png", "content_type": "image/png", "size": 4}
+    )
+    assert response.status_code == 200
+    presigned = response.json()
+
+    assert _post(presigned, b"\x89PNG").status_code == 204
+
+    response = await client.post("/api/admin/upload/complete", json={"key": presigned["key"]})
+    assert response.status_code == 200
+    assert response.json() == {"url": presigned["url"]}
+
+
+@pytest.mark.asyncio
+async def test_presign_over_max_size_is_413(client):
+    response = await client.post(
+        "/api/admin/upload/presign",
+        json={"filename": "huge.png", "content_type": "image/png", "size": settings.storage_max_upload_mb * 1024 * 1024 + 1},
+    )
+
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_complete_missing_object_is_404(client):
+    response = await client.post("/api/admin/upload/complete", json={"key": StorageService.direct_key("photo.png")})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_complete_rejects_foreign_key(client):
+    response = await client.post("/api/admin/upload/complete", json={"key": f"products/{SHA256}.png"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        f"products/{SHA256}.png",
+        f"products/{SHA256[:32]}.png",
+        f"{DIRECT_UPLOAD_PREFIX}../{SHA256[:32]}.png",
+        f"{DIRECT_UPLOAD_PREFIX}{SHA256[:32]}/../../{SHA256}.png",
+        f"{DIRECT_UPLOAD_PREFIX}nested/{SHA256[:32]}.png",
+        f"/{DIRECT_UPLOAD_PREFIX}{SHA256[:32]}.png",
+        f"{DIRECT_UPLOAD_PREFIX}{SHA256[:32]}.png\n",
+        f"{DIRECT_UPLOAD_PREFIX}{SHA256[:32].upper()}.png",
+        f"{DIRECT_UPLOAD_PREFIX}{SHA256[:32]}.png.html",
+        f"{DIRECT_UPLOAD_PREFIX}{SHA256}.png",
+        DIRECT_UPLOAD_PREFIX,
+    ],
+)
+def test_is_direct_key_rejects_other_keys(key):
+    assert not StorageService.is_direct_key(key)
+
+
+def test_is_direct_key_accepts_issued_keys():
+    for filename in ("photo.png", "Photo.JPEG", "no-extension", "odd.ext!"):
+        assert StorageService.is_direct_key(StorageService.direct_key(filename))
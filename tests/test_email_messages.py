@@ -0,0 +1,39 @@
+"""
+Messages built from prepared MIME headers must flatten to the same bytes
+as building MIMEMultipart/MIMEText per send.
+"""
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+import pytest
+
+from app.config import settings
+from app.services.email import build_message
+from app.services.email_templates import render_email
+
+
+def _mime_per_send(rendered, to):
+    message = MIMEMultipart("alternative")
+    message["Subject"] = rendered.subject
+    message["From"] = settings.email_from
+    message["To"] = to
+    message.attach(MIMEText(rendered.text, "plain"))
+    message.attach(MIMEText(rendered.html, "html"))
+    return message
+
+
+@pytest.mark.parametrize("subdomain", ["alice", "zoë"], ids=["ascii", "non_ascii"])
+def test_prepared_message_matches_mime_per_send(subdomain):
+    rendered = render_email(
+        "verify_email_link",
+        subdomain=subdomain,
+        verification_link="https://uigisc.com/verify-email?token=a<b>&c",
+    )
+
+    expected = _mime_per_send(rendered, "user@example.com")
+    built = build_message(rendered, "user@example.com")
+    expected.set_boundary("BOUNDARY")
+    built.set_boundary("BOUNDARY")
+
+    assert built.as_bytes() == expected.as_bytes()
+    assert built.as_string() == expected.as_string()
@@ -0,0 +1,66 @@
+"""
+Conditional GET on public endpoints: ETag revalidation and per-route
+Cache-Control policies.
+"""
+import httpx
+import pytest
+import pytest_asyncio
+from bson import ObjectId
+
+from app.config import settings
+from app.main import app
+from app.routes import public
+from app.services.cache import public_cache
+from tests.fakes import FakeDatabase
+
+COLLECTIONS = {
+    "opportunities": [{"_id": ObjectId(), "name": "Bitnest", "status": "active", "order": 0}],
+    "websites": [{"_id": ObjectId(), "subdomain": "alice", "status": "active", "customizations": {}}],
+}
+
+
+@pytest_asyncio.fixture
+async def client(monkeypatch):
+    monkeypatch.setattr(public, "get_database", lambda: FakeDatabase(COLLECTIONS))
+    public_cache.clear()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    public_cache.clear()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/api/opportunities", "/api/site/alice", "/api/site/alice/opportunities"])
+async def test_matching_etag_gets_304(client, path):
+    first = await client.get(path)
+    again = await client.get(path, headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == first.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_no_last_modified_validator(client):
+    first = await client.get("/api/opportunities")
+    dated = await client.get("/api/opportunities", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+
+    assert "last-modified" not in first.headers
+    assert dated.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_user_edited_pages_always_revalidate(client):
+    assert (await client.get("/api/site/alice")).headers["cache-control"] == "no-cache"
+    assert (await client.get("/api/site/alice/opportunities")).headers["cache-control"] == "no-cache"
+    assert (await client.get("/api/opportunities")).headers["cache-control"] == settings.cache_control_default
+
+
+@pytest.mark.asyncio
+async def test_route_override_wins(client, monkeypatch):
+    monkeypatch.setattr(settings, "cache_control_overrides", "site=public, max-age=5;opportunities=no-store")
+
+    assert (await client.get("/api/site/alice")).headers["cache-control"] == "public, max-age=5"
+    assert (await client.get("/api/opportunities")).headers["cache-control"] == "no-store"
+    assert (await client.get("/api/site/alice/opportunities")).headers["cache-control"] == "no-cache"
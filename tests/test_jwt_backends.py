@@ -0,0 +1,117 @@
+"""
+JWT backends must be interchangeable: a token issued by any backend is
+accepted by every other one, and all of them reject expired, tampered and
+wrong-algorithm tokens.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.jwt_backends import (
+    HmacBackend,
+    JoseBackend,
+    PyJWTBackend,
+    TokenError,
+    get_jwt_backend,
+)
+
+SECRET = "test-secret-key-with-enough-entropy"
+
+BACKENDS = [JoseBackend, HmacBackend]
+try:
+    import jwt  # noqa: F401
+    BACKENDS.append(PyJWTBackend)
+except ImportError:
+    pass
+
+BACKEND_IDS = [backend.name for backend in BACKENDS]
+
+
+def _claims(**overrides) -> dict:
+    claims = {
+        "sub": "admin@example.com",
+        "role": "admin",
+        "name": "Zoë 🚀",
+        "exp": datetime.utcnow() + timedelta(minutes=30),
+    }
+    claims.update(overrides)
+    return claims
+
+
+def _b64(data: dict) -> str:
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+@pytest.mark.parametrize("decoder", BACKENDS, ids=BACKEND_IDS)
+@pytest.mark.parametrize("encoder", BACKENDS, ids=BACKEND_IDS)
+@pytest.mark.parametrize("algorithm", ["HS256", "HS384", "HS512"])
+def test_tokens_are_interchangeable(encoder, decoder, algorithm):
+    token = encoder(SECRET, algorithm).encode(_claims())
+
+    claims = decoder(SECRET, algorithm).decode(token)
+
+    assert claims["sub"] == "admin@example.com"
+    assert claims["role"] == "admin"
+    assert claims["name"] == "Zoë 🚀"
+    assert isinstance(claims["exp"], int)
+
+
+@pytest.mark.parametrize("decoder", BACKENDS, ids=BACKEND_IDS)
+@pytest.mark.parametrize("encoder", BACKENDS, ids=BACKEND_IDS)
+def test_expired_token_is_rejected(encoder, decoder):
+    token = encoder(SECRET, "HS256").encode(_claims(exp=datetime.utcnow() - timedelta(minutes=5)))
+
+    with pytest.raises(TokenError):
+        decoder(SECRET, "HS256").decode(token)
+
+
+@pytest.mark.parametrize("decoder", BACKENDS, ids=BACKEND_IDS)
+@pytest.mark.parametrize("encoder", BACKENDS, ids=BACKEND_IDS)
+def test_tampered_payload_is_rejected(encoder, decoder):
+    header, _, signature = encoder(SECRET, "HS256").encode(_claims()).split(".")
+    forged = _b64(_claims(role="superadmin", exp=int((datetime.utcnow() + timedelta(hours=1)).timestamp())))
+
+    with pytest.raises(TokenError):
+        decoder(SECRET, "HS256").decode(f"{header}.{forged}.{signature}")
+
+
+@pytest.mark.parametrize("decoder", BACKENDS, ids=BACKEND_IDS)
+@pytest.mark.parametrize("encoder", BACKENDS, ids=BACKEND_IDS)
+def test_wrong_secret_is_rejected(encoder, decoder):
+    token = encoder("another-secret-key-entirely", "HS256").encode(_claims())
+
+    with pytest.raises(TokenError):
+        decoder(SECRET, "HS256").decode(token)
+
+
+@pytest.mark.parametrize("decoder", BACKENDS, ids=BACKEND_IDS)
+@pytest.mark.parametrize("encoder", BACKENDS, ids=BACKEND_IDS)
+def test_wrong_algorithm_is_rejected(encoder, decoder):
+    token = encoder(SECRET, "HS512").encode(_claims())
+
+    with pytest.raises(TokenError):
+        decoder(SECRET, "HS256").decode(token)
+
+
+@pytest.mark.parametrize("decoder", BACKENDS, ids=BACKEND_IDS)
+def test_unsigned_token_is_rejected(decoder):
+    header = _b64({"alg": "none", "typ": "JWT"})
+    payload = _b64(_claims(exp=int((datetime.utcnow() + timedelta(hours=1)).timestamp())))
+
+    with pytest.raises(TokenError):
+        decoder(SECRET, "HS256").decode(f"{header}.{payload}.")
+
+
+@pytest.mark.parametrize("decoder", BACKENDS, ids=BACKEND_IDS)
+@pytest.mark.parametrize("token", ["", "not-a-token", "a.b", "a.b.c.d", "....."])
+def test_malformed_token_is_rejected(decoder, token):
+    with pytest.raises(TokenError):
+        decoder(SECRET, "HS256").decode(token)
+
+
+def test_unavailable_backend_falls_back_to_jose():
+    assert get_jwt_backend("unknown", SECRET, "HS256").name == "jose"
+    assert get_jwt_backend("hmac", SECRET, "RS256").name == "jose"
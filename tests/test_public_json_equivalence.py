@@ -0,0 +1,85 @@
+"""
+Public responses must be byte-identical to the original handlers.
+
+Every public endpoint is rendered from the fixture documents in
+tests/public_fixtures.py with FAST_JSON_RESPONSES off (Pydantic + FastAPI
+encoding) and on (plain dicts + orjson). Both are compared byte for byte
+with tests/golden/public_responses.json, which holds the output of the
+handlers as they were before caching and fast JSON were introduced
+(rendered from the baseline revision with the same fixtures), and with
+each other, ETag included.
+"""
+import json
+import os
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.main import app
+from app.routes import public
+from app.services.cache import public_cache
+from tests.fakes import FakeDatabase
+from tests.public_fixtures import FIXTURES, PATHS
+
+GOLDEN_FILE = os.path.join(os.path.dirname(__file__), "golden", "public_responses.json")
+DATASETS = {"fixtures": FIXTURES, "empty": {}}
+
+
+def _golden(dataset: str) -> dict:
+    with open(GOLDEN_FILE, encoding="utf-8") as f:
+        return json.load(f)[dataset]
+
+
+async def _render_all(monkeypatch, collections: dict, fast: bool) -> dict:
+    monkeypatch.setattr(settings, "fast_json_responses", fast)
+    monkeypatch.setattr(public, "get_database", lambda: FakeDatabase(collections))
+    public_cache.clear()
+
+    bodies = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for path in PATHS:
+            response = await client.get(path)
+            bodies[path] = (response.status_code, response.headers.get("etag"), response.content)
+    public_cache.clear()
+    return bodies
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fast", [False, True], ids=["default", "fast"])
+@pytest.mark.parametrize("dataset", sorted(DATASETS))
+async def test_matches_golden_output(monkeypatch, dataset, fast):
+    bodies = await _render_all(monkeypatch, DATASETS[dataset], fast=fast)
+    golden = _golden(dataset)
+
+    for path in PATHS:
+        status_code, _, body = bodies[path]
+        assert (status_code, body) == (golden[path]["status"], golden[path]["body"].encode("utf-8")), path
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dataset", sorted(DATASETS))
+async def test_fast_json_is_byte_identical(monkeypatch, dataset):
+    default = await _render_all(monkeypatch, DATASETS[dataset], fast=False)
+    fast = await _render_all(monkeypatch, DATASETS[dataset], fast=True)
+
+    for path in PATHS:
+        assert fast[path] == default[path], path
+
+
+@pytest.mark.asyncio
+async def test_fixtures_exercise_every_endpoint(monkeypatch):
+    bodies = await _render_all(monkeypatch, FIXTURES, fast=False)
+
+    assert bodies["/api/site/carol"][0] == 404
+    assert bodies["/api/site/nobody/opportunities"][0] == 404
+    for path in PATHS:
+        if "carol" not in path and "nobody" not in path:
+            assert bodies[path][0] == 200, path
+
+    # Overlay links are spliced in; unicode is emitted unescaped
+    alice = bodies["/api/site/alice/opportunities"][2]
+    assert b"https://alice.example.com/join" in alice
+    assert b"https://alice.example.com/legacy" in alice
+    assert "Ünïcødé ✓ 日本語 🚀".encode("utf-8") in alice
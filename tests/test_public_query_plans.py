@@ -0,0 +1,125 @@
+"""
+Every public query shape must be answered from an index, with no in-memory
+SORT stage, using the indexes declared in app.database.INDEX_SPECS.
+
+Needs a MongoDB server (TEST_MONGODB_URL, default MONGODB_URL); skipped when
+none is reachable. Runs against a throwaway database that is dropped after.
+"""
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from app.config import settings
+from app.database import INDEX_SPECS
+
+# (collection, filter, sort, projection, limit, expected index or None for any)
+QUERIES = {
+    "catalog": ("opportunities", {"status": "active"}, [("order", 1)], None, 0, "status_1_order_1"),
+    "check_subdomain": ("users", {"subdomain": "site7"}, None, None, 1, "subdomain_1"),
+    "site": ("websites", {"subdomain": "site7", "status": "active"}, None, None, 1, "subdomain_1"),
+    "site_overlay": ("websites", {"subdomain": "site7", "status": "active"}, None, {"customizations": 1}, 1, "subdomain_1"),
+    "news_media": ("news_media", {"status": "active"}, [("created_at", -1)], None, 0, "status_1_created_at_-1"),
+    "event_categories": ("event_categories", {"status": "active"}, [("order", 1)], None, 0, "status_1_order_1"),
+    "event_category_names": ("event_categories", {"status": "active"}, None, None, 0, None),
+    "event_highlights": (
+        "event_highlights",
+        {"status": "active"},
+        [("order", 1), ("created_at", -1)],
+        None,
+        0,
+        "status_1_order_1_created_at_-1",
+    ),
+    "event_highlights_by_category": (
+        "event_highlights",
+        {"status": "active", "category_id": "category3"},
+        [("order", 1), ("created_at", -1)],
+        None,
+        0,
+        "status_1_category_id_1_order_1_created_at_-1",
+    ),
+    "page_content": ("page_content", {"section_key": "section7"}, None, None, 1, "section_key_1"),
+}
+
+
+def _documents(collection: str, count: int = 300) -> list:
+    """Mostly inactive documents, like a catalog with a long history."""
+    now = datetime.utcnow()
+    docs = []
+    for i in range(count):
+        doc = {
+            "status": "active" if i % 10 == 0 else "inactive",
+            "order": i % 25,
+            "created_at": now - timedelta(minutes=i),
+        }
+        if collection in ("users", "websites"):
+            doc["subdomain"] = f"site{i}"
+            doc["user_id"] = str(i)
+        if collection == "users":
+            doc["email"] = f"user{i}@example.com"
+        if collection == "event_highlights":
+            doc["category_id"] = f"category{i % 7}"
+        if collection == "page_content":
+            doc["section_key"] = f"section{i}"
+        docs.append(doc)
+    return docs
+
+
+@pytest.fixture(scope="module")
+def database():
+    url = os.environ.get("TEST_MONGODB_URL", settings.mongodb_url)
+    client = MongoClient(url, serverSelectionTimeoutMS=1000, connectTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except PyMongoError as e:
+        client.close()
+        pytest.skip(f"MongoDB not reachable at {url}: {e}")
+
+    name = f"test_query_plans_{uuid.uuid4().hex[:8]}"
+    db = client[name]
+    try:
+        for collection, models in INDEX_SPECS.items():
+            if models:
+                db[collection].create_indexes(models)
+        for collection in {query[0] for query in QUERIES.values()}:
+            db[collection].insert_many(_documents(collection))
+        yield db
+    finally:
+        client.drop_database(name)
+        client.close()
+
+
+def _stages(plan) -> list:
+    """Every (stage, indexName) in an explain plan tree, classic or SBE."""
+    found = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            found.append((plan["stage"], plan.get("indexName")))
+        for value in plan.values():
+            found.extend(_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            found.extend(_stages(value))
+    return found
+
+
+@pytest.mark.parametrize("shape", sorted(QUERIES))
+def test_public_query_uses_index_without_sort(database, shape):
+    collection, query, sort, projection, limit, expected_index = QUERIES[shape]
+    cursor = database[collection].find(query, projection)
+    if sort:
+        cursor = cursor.sort(sort)
+    if limit:
+        cursor = cursor.limit(limit)
+
+    stages = _stages(cursor.explain()["queryPlanner"]["winningPlan"])
+    # MongoDB 8 reports unique point lookups as EXPRESS_IXSCAN
+    indexes = [index for stage, index in stages if stage.endswith("IXSCAN")]
+
+    assert indexes, stages
+    assert not any(stage in ("COLLSCAN", "SORT") for stage, _ in stages), stages
+    if expected_index:
+        assert expected_index in indexes, stages
@@ -0,0 +1,53 @@
+"""
+Spliced site catalogs must be byte-identical to rendering the overridden
+items directly, wherever the buttons sit in the item.
+"""
+import pytest
+
+from app.config import settings
+from app.services.serialization import render_json
+from app.services.site_catalog import CatalogBase, compile_overlay
+
+
+def _item(opp_id: str, order: list) -> dict:
+    fields = {
+        "id": opp_id,
+        "name": f"Opportunity {opp_id} ✓",
+        "description": "line\nbreak",
+        "primary_button": {"text": "Join Now", "link": "https://join.example.com", "type": "link"},
+        "secondary_button": None,
+        "order": 1,
+    }
+    return {key: fields[key] for key in order}
+
+
+LAYOUTS = {
+    "adjacent": ["id", "name", "primary_button", "secondary_button", "description", "order"],
+    "reversed": ["id", "secondary_button", "primary_button", "name", "description", "order"],
+    "apart": ["primary_button", "id", "name", "description", "order", "secondary_button"],
+}
+
+
+@pytest.mark.parametrize("fast", [False, True], ids=["default", "fast"])
+@pytest.mark.parametrize("layout", sorted(LAYOUTS))
+def test_overlay_splice_matches_direct_render(monkeypatch, fast, layout):
+    monkeypatch.setattr(settings, "fast_json_responses", fast)
+    items = [_item("a", LAYOUTS[layout]), _item("b", LAYOUTS[layout])]
+    catalog = CatalogBase(items)
+
+    overlay = compile_overlay({"a_primary": "https://site.example.com/ü", "a_secondary": "https://site.example.com/2"})
+
+    expected = [dict(item) for item in items]
+    expected[0]["primary_button"] = {**items[0]["primary_button"], "link": "https://site.example.com/ü"}
+    expected[0]["secondary_button"] = {"text": "Learn More", "link": "https://site.example.com/2", "type": "link"}
+
+    assert catalog.body == render_json(items)
+    assert catalog.render(overlay) == render_json(expected)
+    assert catalog.render(compile_overlay({})) is catalog.body
+
+
+def test_missing_button_field_is_an_error():
+    item = _item("a", ["id", "name", "primary_button"])
+
+    with pytest.raises(ValueError):
+        CatalogBase([item])
@@ -0,0 +1,217 @@
+"""
+SMTP connection pool against a local aiosmtpd server: connections are
+reused across sends, the pool recovers when the server drops them (seen
+by the NOOP health check or mid-send), a failed connect gives the slot
+back, and send_emails reports success per message.
+
+Skipped when aiosmtpd is not installed.
+"""
+import socket
+from email.message import EmailMessage
+
+import pytest
+import pytest_asyncio
+
+pytest.importorskip("aiosmtpd")
+
+from aiosmtpd.controller import Controller  # noqa: E402
+from aiosmtpd.smtp import AuthResult  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.services import email  # noqa: E402
+from app.services.email import SmtpPool, send_emails  # noqa: E402
+from app.services.metrics import metrics  # noqa: E402
+
+POOL_SIZE = 2
+
+
+class RecordingHandler:
+    """Keeps every delivered message and the client address it came from."""
+
+    def __init__(self):
+        self.messages = []
+        self.peers = set()
+        self.rejected = {"rejected@example.com"}
+        self.drop_on = None
+
+    def _drop(self, server, command: str) -> bool:
+        """Close the client socket instead of answering `command` (once)."""
+        if self.drop_on != command:
+            return False
+        self.drop_on = None
+        server.transport.close()
+        return True
+
+    async def handle_NOOP(self, server, session, envelope, arg):
+        if self._drop(server, "NOOP"):
+            return "421 Closing"
+        return "250 OK"
+
+    async def handle_MAIL(self, server, session, envelope, address, mail_options):
+        if self._drop(server, "MAIL"):
+            return "421 Closing"
+        envelope.mail_from = address
+        envelope.mail_options.extend(mail_options)
+        return "250 OK"
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.rejected:
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        self.peers.add(session.peer)
+        return "250 OK"
+
+
+def _accept_any(server, session, envelope, mechanism, auth_data):
+    return AuthResult(success=True)
+
+
+class SmtpServer:
+    """aiosmtpd on a fixed local port that can be stopped and restarted."""
+
+    def __init__(self):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.port = probe.getsockname()[1]
+        self.handler = RecordingHandler()
+        self._controller = None
+
+    def start(self) -> None:
+        self._controller = Controller(
+            self.handler,
+            hostname="127.0.0.1",
+            port=self.port,
+            authenticator=_accept_any,
+            auth_require_tls=False,
+        )
+        self._controller.start()
+
+    def stop(self) -> None:
+        """Stop listening and drop every open client connection."""
+        if self._controller is not None:
+            self._controller.stop()
+            self._controller = None
+
+    def restart(self) -> None:
+        self.stop()
+        self.start()
+
+
+def _message(n: int) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = f"Message {n}"
+    message["From"] = "noreply@example.com"
+    message["To"] = f"user{n}@example.com"
+    message.set_content(f"Body {n}")
+    return message
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = SmtpServer()
+    monkeypatch.setattr(settings, "smtp_host", "127.0.0.1")
+    monkeypatch.setattr(settings, "smtp_port", server.port)
+    monkeypatch.setattr(settings, "smtp_user", "mailer")
+    monkeypatch.setattr(settings, "smtp_password", "secret")
+    monkeypatch.setattr(settings, "smtp_start_tls", False)
+    server.start()
+    yield server
+    server.stop()
+
+
+def _make_pool(monkeypatch, idle_check_seconds: float) -> SmtpPool:
+    pool = SmtpPool(size=POOL_SIZE, idle_check_seconds=idle_check_seconds)
+    monkeypatch.setattr(email, "smtp_pool", pool)
+    return pool
+
+
+@pytest_asyncio.fixture
+async def pool(server, monkeypatch):
+    pool = _make_pool(monkeypatch, idle_check_seconds=3600)
+    yield pool
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_batches_reuse_pooled_connections(server, pool):
+    first = await send_emails([_message(n) for n in range(10)])
+    second = await send_emails([_message(n) for n in range(10, 20)])
+
+    assert first == [True] * 10
+    assert second == [True] * 10
+    assert len(server.handler.messages) == 20
+    assert len(server.handler.peers) <= POOL_SIZE
+
+
+@pytest.mark.asyncio
+async def test_recovers_after_server_restart(server, pool):
+    assert await send_emails([_message(0)]) == [True]
+    peers_before = set(server.handler.peers)
+
+    # Every pooled connection is now closed by the server
+    server.restart()
+
+    assert await send_emails([_message(1), _message(2)]) == [True, True]
+    assert len(server.handler.messages) == 3
+    assert server.handler.peers - peers_before
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "idle_check_seconds, drop_on, recovery",
+    [
+        (0, "NOOP", "smtp.stale"),        # health check before reuse finds it dead
+        (3600, "MAIL", "smtp.retried"),   # no health check: the send fails and is retried
+    ],
+    ids=["stale_noop", "dropped_mid_send"],
+)
+async def test_recovers_when_server_drops_connection(server, monkeypatch, idle_check_seconds, drop_on, recovery):
+    pool = _make_pool(monkeypatch, idle_check_seconds)
+    try:
+        # Open every pooled connection so the next send reuses one
+        assert await send_emails([_message(n) for n in range(POOL_SIZE)]) == [True] * POOL_SIZE
+        peers_before = set(server.handler.peers)
+        recovered_before = metrics.snapshot()["counters"].get(recovery, 0)
+
+        server.handler.drop_on = drop_on
+
+        assert await send_emails([_message(POOL_SIZE)]) == [True]
+        assert server.handler.drop_on is None
+        assert len(server.handler.messages) == POOL_SIZE + 1
+        assert server.handler.peers - peers_before
+        assert metrics.snapshot()["counters"].get(recovery, 0) == recovered_before + 1
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_connect_returns_connection_to_pool(server, pool):
+    server.stop()
+
+    assert await send_emails([_message(0), _message(1)]) == [False, False]
+    assert pool._idle.qsize() == POOL_SIZE
+
+    server.start()
+
+    assert await send_emails([_message(n) for n in range(2, 6)]) == [True] * 4
+    assert pool._idle.qsize() == POOL_SIZE
+    assert len(server.handler.messages) == 4
+
+
+@pytest.mark.asyncio
+async def test_send_emails_reports_success_per_message(server, pool):
+    refused = _message(1)
+    del refused["To"]
+    refused["To"] = "rejected@example.com"
+
+    results = await send_emails([_message(0), refused, _message(2)])
+
+    assert results == [True, False, True]
+    assert [envelope.rcpt_tos for envelope in server.handler.messages] == [
+        ["user0@example.com"],
+        ["user2@example.com"],
+    ]
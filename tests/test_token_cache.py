@@ -0,0 +1,127 @@
+"""
+Verified access token cache: hits skip JWT verification, entries expire at
+the token's exp or the TTL (whichever is first), the LRU is bounded, only
+successful verifications are cached, and 0 entries disables it.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.schemas.user import TokenData
+from app.services import auth
+from app.services.auth import VerifiedTokenCache
+from app.services.jwt_backends import HmacBackend
+
+SECRET = "token-cache-test-secret"
+
+
+class CountingBackend:
+    """Wraps a JWT backend and counts full verifications."""
+
+    def __init__(self):
+        self._backend = HmacBackend(SECRET, "HS256")
+        self.decodes = 0
+
+    def encode(self, claims: dict) -> str:
+        return self._backend.encode(claims)
+
+    def decode(self, token: str) -> dict:
+        self.decodes += 1
+        return self._backend.decode(token)
+
+
+class Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = CountingBackend()
+    monkeypatch.setattr(auth, "jwt_backend", backend)
+    monkeypatch.setattr(auth, "token_cache", VerifiedTokenCache(max_entries=100, ttl_seconds=300))
+    return backend
+
+
+def _token(backend, minutes: int = 30, **claims) -> str:
+    claims.setdefault("sub", "user-1")
+    claims.setdefault("email", "user@example.com")
+    claims.setdefault("role", "admin")
+    claims["exp"] = datetime.utcnow() + timedelta(minutes=minutes)
+    return backend.encode(claims)
+
+
+def test_hit_returns_same_token_data_without_verifying(backend):
+    token = _token(backend)
+
+    first = auth.decode_access_token(token)
+    second = auth.decode_access_token(token)
+
+    assert first == TokenData(user_id="user-1", email="user@example.com", role="admin")
+    assert second is first
+    assert backend.decodes == 1
+
+
+def test_failed_verifications_are_not_cached(backend):
+    expired = _token(backend, minutes=-5)
+    no_subject = backend.encode({"email": "user@example.com", "exp": datetime.utcnow() + timedelta(minutes=5)})
+    tampered = _token(backend)[:-2] + "AA"
+
+    for token in (expired, no_subject, tampered, "not-a-token"):
+        assert auth.decode_access_token(token) is None
+        assert auth.decode_access_token(token) is None
+
+    assert backend.decodes == 8
+    assert len(auth.token_cache._entries) == 0
+
+
+def test_zero_max_entries_disables_cache(backend, monkeypatch):
+    monkeypatch.setattr(auth, "token_cache", VerifiedTokenCache(max_entries=0, ttl_seconds=300))
+    token = _token(backend)
+
+    assert auth.decode_access_token(token) is not None
+    assert auth.decode_access_token(token) is not None
+
+    assert backend.decodes == 2
+    assert len(auth.token_cache._entries) == 0
+
+
+@pytest.mark.parametrize(
+    "ttl, exp_in, expires_after",
+    [
+        (300, 60, 60),    # exp comes first
+        (30, 3600, 30),   # TTL comes first
+        (300, None, 300), # no exp claim: TTL only
+    ],
+)
+def test_entry_expires_at_exp_or_ttl(monkeypatch, ttl, exp_in, expires_after):
+    clock = Clock(1_000_000.0)
+    monkeypatch.setattr(auth.time, "time", clock)
+    cache = VerifiedTokenCache(max_entries=10, ttl_seconds=ttl)
+    token_data = TokenData(user_id="user-1")
+
+    cache.set("token", token_data, None if exp_in is None else clock.now + exp_in)
+
+    clock.now += expires_after - 1
+    assert cache.get("token") is token_data
+    clock.now += 1
+    assert cache.get("token") is None
+    assert len(cache._entries) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = VerifiedTokenCache(max_entries=2, ttl_seconds=300)
+    a, b, c = (TokenData(user_id=user_id) for user_id in "abc")
+
+    cache.set("a", a, None)
+    cache.set("b", b, None)
+    assert cache.get("a") is a  # a is now the most recently used
+    cache.set("c", c, None)
+
+    assert len(cache._entries) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is a
+    assert cache.get("c") is c